@@ -5,6 +5,7 @@ import mathutils
 import json
 import threading
 import socket
+import struct
 import time
 import requests
 import tempfile
@@ -14,6 +15,7 @@ import shutil
 import zipfile
 from bpy.props import StringProperty, IntProperty, BoolProperty, EnumProperty
 import io
+import base64
 from contextlib import redirect_stdout, suppress
 
 bl_info = {
@@ -120,53 +122,49 @@ class BlenderMCPServer:
         print("Server thread stopped")
 
     def _handle_client(self, client):
-        """Handle connected client"""
+        """Handle connected client
+
+        Requests come either as bare JSON objects (as the blender-mcp server
+        sends them) or length-prefixed: a 4-byte big-endian size, then that
+        many bytes of JSON. A bare request starts with '{', which as a size
+        prefix would mean a message of nearly 2 GB, so the first byte tells
+        the two apart. Each response uses the same framing as its request.
+        """
         print("Client handler started")
         client.settimeout(None)  # No timeout
-        buffer = b''
+        buffer = bytearray()
 
         try:
             while self.running:
                 # Receive data
                 try:
-                    data = client.recv(8192)
+                    data = client.recv(65536)
                     if not data:
                         print("Client disconnected")
                         break
 
                     buffer += data
-                    try:
-                        # Try to parse command
-                        command = json.loads(buffer.decode('utf-8'))
-                        buffer = b''
-
-                        # Execute command in Blender's main thread
-                        def execute_wrapper():
+                    while buffer:
+                        if buffer[:1] == b'{':
                             try:
-                                response = self.execute_command(command)
-                                response_json = json.dumps(response)
-                                try:
-                                    client.sendall(response_json.encode('utf-8'))
-                                except:
-                                    print("Failed to send response - client disconnected")
-                            except Exception as e:
-                                print(f"Error executing command: {str(e)}")
-                                traceback.print_exc()
-                                try:
-                                    error_response = {
-                                        "status": "error",
-                                        "message": str(e)
-                                    }
-                                    client.sendall(json.dumps(error_response).encode('utf-8'))
-                                except:
-                                    pass
-                            return None
-
-                        # Schedule execution in main thread
-                        bpy.app.timers.register(execute_wrapper, first_interval=0.0)
-                    except json.JSONDecodeError:
-                        # Incomplete data, wait for more
-                        pass
+                                # Try to parse command
+                                command = json.loads(buffer.decode('utf-8'))
+                            except json.JSONDecodeError:
+                                # Incomplete data, wait for more
+                                break
+                            buffer.clear()
+                            framed = False
+                        else:
+                            if len(buffer) < 4:
+                                break
+                            size = struct.unpack('>I', buffer[:4])[0]
+                            if len(buffer) < 4 + size:
+                                break
+                            command = json.loads(buffer[4:4 + size])
+                            del buffer[:4 + size]
+                            framed = True
+
+                        self._schedule_command(client, command, framed)
                 except Exception as e:
                     print(f"Error receiving data: {str(e)}")
                     break
@@ -179,6 +177,51 @@ class BlenderMCPServer:
                 pass
             print("Client handler stopped")
 
+    def _schedule_command(self, client, command, framed):
+        """Execute a command in Blender's main thread and send the response"""
+        def execute_wrapper():
+            try:
+                response = self.execute_command(command)
+                try:
+                    self._send_response(client, response, framed)
+                except:
+                    print("Failed to send response - client disconnected")
+            except Exception as e:
+                print(f"Error executing command: {str(e)}")
+                traceback.print_exc()
+                try:
+                    error_response = {
+                        "status": "error",
+                        "message": str(e)
+                    }
+                    self._send_response(client, error_response, framed)
+                except:
+                    pass
+            return None
+
+        # Schedule execution in main thread
+        bpy.app.timers.register(execute_wrapper, first_interval=0.0)
+
+    @staticmethod
+    def _send_response(client, response, framed):
+        # A handler result may carry raw bytes under "binary". Framed replies
+        # send them after the JSON frame as-is (its "binary_length" says how
+        # many); bare replies can only carry them base64-encoded
+        result = response.get("result")
+        binary = result.pop("binary", None) if isinstance(result, dict) else None
+        if binary is not None:
+            if framed:
+                response["binary_length"] = len(binary)
+            else:
+                result["image_data"] = base64.b64encode(binary).decode('ascii')
+
+        payload = json.dumps(response).encode('utf-8')
+        if framed:
+            payload = struct.pack('>I', len(payload)) + payload
+            if binary is not None:
+                payload += binary
+        client.sendall(payload)
+
     def execute_command(self, command):
         """Execute a command in the main Blender thread"""
         try:
@@ -203,7 +246,9 @@ class BlenderMCPServer:
             "get_scene_info": self.get_scene_info,
             "get_object_info": self.get_object_info,
             "get_viewport_screenshot": self.get_viewport_screenshot,
+            "get_viewport_image": self.get_viewport_image,
             "execute_code": self.execute_code,
+            "execute_batch": self.execute_batch,
             "get_polyhaven_status": self.get_polyhaven_status,
             "get_hyper3d_status": self.get_hyper3d_status,
             "get_sketchfab_status": self.get_sketchfab_status,
@@ -402,6 +447,91 @@ class BlenderMCPServer:
         except Exception as e:
             return {"error": str(e)}
 
+    def get_viewport_image(self, max_size=800, format="png"):
+        """
+        Capture the 3D viewport and return the encoded image itself.
+
+        Like get_viewport_screenshot, but the caller needs no file path and
+        the image comes back in the reply. The viewport is drawn straight
+        into a GPU offscreen of the output size; if that fails, it falls back
+        to a full-size screenshot scaled down afterwards.
+        """
+        try:
+            width, height, image_bytes = self._draw_viewport_offscreen(max_size, format)
+        except Exception as e:
+            print(f"Offscreen viewport capture failed, using screenshot: {str(e)}")
+            fd, filepath = tempfile.mkstemp(suffix=f".{format.lower()}")
+            os.close(fd)
+            try:
+                info = self.get_viewport_screenshot(max_size=max_size, filepath=filepath, format=format)
+                if "error" in info:
+                    raise Exception(info["error"])
+
+                with open(filepath, "rb") as f:
+                    image_bytes = f.read()
+            finally:
+                os.remove(filepath)
+            width, height = info["width"], info["height"]
+
+        return {
+            "format": format.lower(),
+            "width": width,
+            "height": height,
+            "binary": image_bytes
+        }
+
+    def _draw_viewport_offscreen(self, max_size, format):
+        """Draw the 3D viewport at its output size on the GPU and encode it"""
+        import gpu
+        import numpy as np
+
+        area = next((a for a in bpy.context.screen.areas if a.type == 'VIEW_3D'), None)
+        if not area:
+            raise Exception("No 3D viewport found")
+        region = next(r for r in area.regions if r.type == 'WINDOW')
+        space = area.spaces.active
+
+        # Never larger than the viewport itself, like the screenshot path
+        scale = min(1.0, max_size / max(region.width, region.height))
+        width = max(1, int(region.width * scale))
+        height = max(1, int(region.height * scale))
+
+        offscreen = gpu.types.GPUOffScreen(width, height)
+        try:
+            offscreen.draw_view3d(
+                bpy.context.scene,
+                bpy.context.view_layer,
+                space,
+                region,
+                space.region_3d.view_matrix,
+                space.region_3d.window_matrix,
+                do_color_management=True
+            )
+            with offscreen.bind():
+                framebuffer = gpu.state.active_framebuffer_get()
+                buffer = framebuffer.read_color(0, 0, width, height, 4, 0, 'UBYTE')
+        finally:
+            offscreen.free()
+
+        # Rows come back bottom-up, which is also how image pixels are stored
+        pixels = np.asarray(buffer, dtype=np.uint8).ravel().astype(np.float32) / 255.0
+
+        image = bpy.data.images.new("BlenderMCP_Viewport", width, height, alpha=True)
+        fd, filepath = tempfile.mkstemp(suffix=f".{format.lower()}")
+        os.close(fd)
+        try:
+            image.pixels.foreach_set(pixels)
+            image.filepath_raw = filepath
+            image.file_format = format.upper()
+            image.save()
+            with open(filepath, "rb") as f:
+                image_bytes = f.read()
+        finally:
+            bpy.data.images.remove(image)
+            os.remove(filepath)
+
+        return width, height, image_bytes
+
     def execute_code(self, code):
         """Execute arbitrary Blender Python code"""
         # This is powerful but potentially dangerous - use with caution
@@ -421,6 +551,20 @@ class BlenderMCPServer:
 
 
 
+    def execute_batch(self, codes):
+        """Execute several code snippets in order, answering them in one reply
+
+        A failing snippet is reported in its own entry and does not stop
+        the ones after it.
+        """
+        results = []
+        for code in codes:
+            try:
+                results.append(self.execute_code(code))
+            except Exception as e:
+                results.append({"executed": False, "error": str(e)})
+        return results
+
     def get_polyhaven_categories(self, asset_type):
         """Get categories for a specific asset type from Polyhaven"""
         try:
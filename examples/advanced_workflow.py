@@ -3,37 +3,72 @@ Advanced Usage: Multi-scene creation with custom agents
 """
 
 import asyncio
+import os
+import textwrap
+from functools import lru_cache
+from pathlib import Path
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 import sys
 sys.path.append("../src")
 from colossus_blender import (
+    BlenderMCPClient,
     ColossusD5Orchestrator,
     WorkflowState,
     create_blender_client,
     get_gpu_config
 )
 
+SYSTEM_PROMPT_PATH = "../prompts/blender_mcp_system_prompt.md"
+
+# Per-scene reset sent as one execute_code call: same result as
+# clear_scene(keep_camera=True) without the selection operators, and the
+# timeline is rewound so every scene starts from frame 1.
+RESET_AND_INIT_SNIPPET = textwrap.dedent("""
+    import bpy
+    for obj in [o for o in bpy.data.objects if o.type not in ('CAMERA', 'LIGHT')]:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    bpy.context.scene.frame_set(1)
+""")
+
+
+@lru_cache(maxsize=4)
+def _load_prompt(path: str) -> str:
+    """Read a prompt file once per process"""
+    return Path(path).read_text(encoding="utf-8")
+
+
+async def _with_blender(*demos):
+    """Run single-instance demos in turn on one shared Blender connection
+
+    The connection is opened once and closed on the same loop, after the
+    last demo (or the first failure).
+    """
+    blender = await create_blender_client(mode="socket")
+    try:
+        for demo in demos:
+            await demo(blender)
+    finally:
+        await blender.disconnect()
+
 
 async def create_multiple_scenes():
-    """Create multiple scenes and compare quality"""
+    """Create multiple scenes and compare quality
+
+    Scenes run concurrently, up to COLOSSUS_MAX_CONCURRENCY at a time
+    (default 1), and the first failure cancels the rest. Each running scene
+    clears and rebuilds its scene, so it needs its own Blender instance:
+    instances are expected on consecutive ports starting at
+    BLENDER_BASE_PORT (default 9876).
+    """
 
     # Initialize
     claude = ChatAnthropic(model="claude-3-5-sonnet-20241022")
     gemini = ChatGoogleGenerativeAI(model="gemini-2.5-pro")
-    blender = await create_blender_client(mode="socket")
 
-    with open("../prompts/blender_mcp_system_prompt.md", "r") as f:
-        system_prompt = f.read()
-
-    orchestrator = ColossusD5Orchestrator(
-        claude_llm=claude,
-        vision_llm=gemini,
-        blender_mcp_client=blender,
-        system_prompt=system_prompt,
-        gpu_mode="3090"
-    )
+    system_prompt = _load_prompt(SYSTEM_PROMPT_PATH)
 
     # Define multiple scene intents
     scenes = [
@@ -54,55 +89,103 @@ async def create_multiple_scenes():
         }
     ]
 
-    results = []
-
-    for idx, scene in enumerate(scenes, 1):
-        print(f"\n{'=' * 60}")
-        print(f"Scene {idx}/{len(scenes)}: {scene['name']}")
-        print(f"{'=' * 60}")
-
-        # Clear scene first
-        await blender.clear_scene(keep_camera=True)
-
-        # Create state
-        state = WorkflowState(
-            user_intent=scene['intent'],
-            max_iterations=3,
-            satisfaction_threshold=scene['threshold']
-        )
+    # Pool of Blender instances; waiting on it bounds concurrency the way a
+    # semaphore would, and also tells each scene which instance it owns.
+    max_concurrency = int(os.getenv("COLOSSUS_MAX_CONCURRENCY", "1"))
+    base_port = int(os.getenv("BLENDER_BASE_PORT", "9876"))
+    free_ports: asyncio.Queue = asyncio.Queue()
+    for offset in range(max(1, min(max_concurrency, len(scenes)))):
+        free_ports.put_nowait(base_port + offset)
+
+    async def run_scene(idx: int, scene: dict) -> dict:
+        port = await free_ports.get()
+        try:
+            blender = await create_blender_client(mode="socket", port=port)
+            try:
+                print(f"\n{'=' * 60}")
+                print(f"Scene {idx}/{len(scenes)}: {scene['name']} (Blender port {port})")
+                print(f"{'=' * 60}")
+
+                # Reset scene first
+                await blender.execute_code(RESET_AND_INIT_SNIPPET)
+
+                orchestrator = ColossusD5Orchestrator(
+                    claude_llm=claude,
+                    vision_llm=gemini,
+                    blender_mcp_client=blender,
+                    system_prompt=system_prompt,
+                    gpu_mode="3090"
+                )
+
+                # Create state
+                state = WorkflowState(
+                    user_intent=scene['intent'],
+                    max_iterations=3,
+                    satisfaction_threshold=scene['threshold']
+                )
+
+                # Run workflow
+                final_state = await orchestrator.run(state)
+
+                print(f"\n{scene['name']}: {final_state.quality_score:.1%} quality, {final_state.current_iteration + 1} iterations")
+
+                return {
+                    "scene_name": scene['name'],
+                    "quality_score": final_state.quality_score,
+                    "iterations": final_state.current_iteration + 1,
+                    "satisfied": final_state.is_satisfied,
+                    "feedback": final_state.visual_feedback
+                }
+            finally:
+                await blender.disconnect()
+        finally:
+            free_ports.put_nowait(port)
+
+    tasks = [
+        asyncio.create_task(run_scene(idx, scene), name=f"scene:{scene['name']}")
+        for idx, scene in enumerate(scenes, 1)
+    ]
 
-        # Run workflow
-        final_state = await orchestrator.run(state)
+    # Structured run: the first failing scene cancels its siblings, so no
+    # scene keeps driving Blender after the batch has already failed.
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Save results
-        results.append({
-            "scene_name": scene['name'],
-            "quality_score": final_state.quality_score,
-            "iterations": final_state.current_iteration + 1,
-            "satisfied": final_state.is_satisfied,
-            "feedback": final_state.visual_feedback
-        })
+    failures = [task for task in tasks if task in done and task.exception() is not None]
+    for task in failures:
+        print(f"\n{task.get_name()} failed: {task.exception()!r}")
+    if failures:
+        raise failures[0].exception()
 
-        print(f"\nResult: {final_state.quality_score:.1%} quality, {final_state.current_iteration + 1} iterations")
+    results = [task.result() for task in tasks]
 
     # Summary
     print(f"\n{'=' * 60}")
     print("SUMMARY OF ALL SCENES")
     print(f"{'=' * 60}")
 
-    for result in results:
-        print(f"\n{result['scene_name']}:")
-        print(f"  Quality: {result['quality_score']:.1%}")
-        print(f"  Iterations: {result['iterations']}")
-        print(f"  Satisfied: {result['satisfied']}")
-
-    avg_quality = sum(r['quality_score'] for r in results) / len(results)
-    print(f"\nAverage Quality: {avg_quality:.1%}")
+    # Format the table and total the scores in one pass, then write it once
+    total_quality = 0.0
+    lines = []
+    for r in results:
+        total_quality += r['quality_score']
+        lines.append(
+            f"\n{r['scene_name']}:\n"
+            f"  Quality: {r['quality_score']:.1%}\n"
+            f"  Iterations: {r['iterations']}\n"
+            f"  Satisfied: {r['satisfied']}\n"
+        )
+    sys.stdout.write("".join(lines))
 
-    await blender.disconnect()
+    if results:
+        print(f"\nAverage Quality: {total_quality / len(results):.1%}")
 
 
-async def benchmark_gpu_performance():
+async def benchmark_gpu_performance(blender: BlenderMCPClient):
     """Benchmark GPU with different quality settings"""
 
     print("\n=== GPU Performance Benchmark ===")
@@ -123,8 +206,6 @@ async def benchmark_gpu_performance():
         print(f"  Resolution: {settings.resolution_percentage}%")
 
     # Generate and execute benchmark code
-    blender = await create_blender_client(mode="socket")
-
     from colossus_blender.gpu_config import generate_gpu_benchmark_code
 
     benchmark_code = generate_gpu_benchmark_code()
@@ -137,18 +218,14 @@ async def benchmark_gpu_performance():
     else:
         print(f"\nBenchmark failed: {result.get('errors')}")
 
-    await blender.disconnect()
-
 
-async def iterative_refinement_demo():
+async def iterative_refinement_demo(blender: BlenderMCPClient):
     """Demo: Show how refinement improves quality over iterations"""
 
     claude = ChatAnthropic(model="claude-3-5-sonnet-20241022")
     gemini = ChatGoogleGenerativeAI(model="gemini-2.5-pro")
-    blender = await create_blender_client(mode="socket")
 
-    with open("../prompts/blender_mcp_system_prompt.md", "r") as f:
-        system_prompt = f.read()
+    system_prompt = _load_prompt(SYSTEM_PROMPT_PATH)
 
     orchestrator = ColossusD5Orchestrator(
         claude_llm=claude,
@@ -172,34 +249,49 @@ async def iterative_refinement_demo():
 
     final_state = await orchestrator.run(state)
 
-    # Show iteration-by-iteration improvement
-    print("\n=== Iteration History ===")
-    for i, iter_data in enumerate(final_state.iteration_history, 1):
-        print(f"\nIteration {i}:")
-        print(f"  Score: {iter_data.get('quality_score', 0):.1%}")
-        print(f"  Issues: {iter_data.get('issues', [])}")
-        print(f"  Improvements: {iter_data.get('suggestions', [])}")
-
-    await blender.disconnect()
+    # Show iteration-by-iteration improvement, written as one block
+    sys.stdout.write("".join([
+        "\n=== Iteration History ===\n",
+        *(
+            f"\nIteration {i}:\n"
+            f"  Score: {iter_data.get('quality_score', 0):.1%}\n"
+            f"  Issues: {iter_data.get('issues', [])}\n"
+            f"  Improvements: {iter_data.get('suggestions', [])}\n"
+            for i, iter_data in enumerate(final_state.iteration_history, 1)
+        ),
+    ]))
 
 
 if __name__ == "__main__":
     import sys
 
+    # uvloop's event loop when installed (not available on Windows)
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+
     if len(sys.argv) > 1:
         mode = sys.argv[1]
 
-        if mode == "multi":
-            asyncio.run(create_multiple_scenes())
-        elif mode == "benchmark":
-            asyncio.run(benchmark_gpu_performance())
-        elif mode == "refine":
-            asyncio.run(iterative_refinement_demo())
-        else:
-            print("Usage: python advanced_workflow.py [multi|benchmark|refine]")
+        try:
+            if mode == "multi":
+                run(create_multiple_scenes())
+            elif mode == "benchmark":
+                run(_with_blender(benchmark_gpu_performance))
+            elif mode == "refine":
+                run(_with_blender(iterative_refinement_demo))
+            elif mode == "single":
+                # Both single-instance demos over one Blender connection
+                run(_with_blender(benchmark_gpu_performance, iterative_refinement_demo))
+            else:
+                print("Usage: python advanced_workflow.py [multi|benchmark|refine|single]")
+        except Exception as e:
+            sys.exit(f"{mode} failed: {e!r}")
     else:
         print("Available modes:")
         print("  multi     - Create multiple scenes and compare")
         print("  benchmark - Benchmark GPU performance")
         print("  refine    - Demo iterative refinement")
+        print("  single    - Benchmark, then refine, on one Blender connection")
         print("\nUsage: python advanced_workflow.py <mode>")
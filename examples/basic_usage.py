@@ -101,4 +101,10 @@ if __name__ == "__main__":
     # 2. ANTHROPIC_API_KEY env var set
     # 3. GOOGLE_API_KEY env var set
 
-    asyncio.run(main())
+    # uvloop's event loop when installed (not available on Windows)
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+
+    run(main())
@@ -4,6 +4,7 @@ Demonstrates full pipeline from OBJ import to game-ready FBX export
 """
 
 import asyncio
+import os
 from pathlib import Path
 import sys
 
@@ -97,7 +98,13 @@ async def example_1_simple_battleship():
 
 
 async def example_2_batch_processing():
-    """Example 2: Batch process multiple battleship meshes"""
+    """Example 2: Batch process multiple battleship meshes
+
+    Ships are pulled from a queue by COLOSSUS_BATCH_CONCURRENCY workers
+    (default 1). Each worker drives its own Blender instance, on consecutive
+    ports starting at BLENDER_BASE_PORT (default 9876), since processing
+    rebuilds the open scene.
+    """
 
     print("\n" + "=" * 70)
     print("EXAMPLE 2: Batch Processing Multiple Ships")
@@ -110,41 +117,85 @@ async def example_2_batch_processing():
         ("./test_assets/uss_wisconsin.obj", "USS_Wisconsin_BB64", "war_thunder"),
     ]
 
-    # Connect to Blender
-    blender = await create_blender_client(mode="socket")
-
-    agent = GameAssetAgent(
-        blender_mcp_client=blender,
-        output_dir=Path("./outputs/game_assets/batch")
-    )
-
-    results = []
-
-    for mesh_path, asset_name, profile_name in ships:
+    queue: asyncio.Queue = asyncio.Queue()
+    for idx, (mesh_path, asset_name, profile_name) in enumerate(ships):
         input_path = Path(mesh_path)
 
         if not input_path.exists():
             print(f"\n⚠ Skipping {asset_name}: File not found")
             continue
 
-        print(f"\n{'='*70}")
-        print(f"Processing: {asset_name}")
-        print(f"{'='*70}")
+        queue.put_nowait((idx, input_path, asset_name, profile_name))
 
-        profile = get_profile(profile_name)
+    # Results keyed by ship index so the summary keeps the input order
+    results_by_idx = {}
 
-        metadata = await agent.process_mesh(
-            input_mesh_path=input_path,
-            profile=profile,
-            asset_name=asset_name
+    async def worker(port: int):
+        blender = await create_blender_client(mode="socket", port=port)
+
+        agent = GameAssetAgent(
+            blender_mcp_client=blender,
+            output_dir=Path("./outputs/game_assets/batch")
         )
 
-        results.append({
-            "name": asset_name,
-            "triangles": metadata.lod0_triangles,
-            "quality": metadata.overall_quality,
-            "passed": metadata.passes_validation
-        })
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    break
+
+                idx, input_path, asset_name, profile_name = item
+                try:
+                    print(f"\n{'='*70}")
+                    print(f"Processing: {asset_name} (Blender port {port})")
+                    print(f"{'='*70}")
+
+                    profile = get_profile(profile_name)
+
+                    metadata = await agent.process_mesh(
+                        input_mesh_path=input_path,
+                        profile=profile,
+                        asset_name=asset_name
+                    )
+
+                    results_by_idx[idx] = {
+                        "name": asset_name,
+                        "triangles": metadata.lod0_triangles,
+                        "quality": metadata.overall_quality,
+                        "passed": metadata.passes_validation
+                    }
+                except Exception as e:
+                    print(f"\n✗ {asset_name} failed: {e}")
+                finally:
+                    queue.task_done()
+        finally:
+            await blender.disconnect()
+
+    num_workers = max(1, min(queue.qsize(), int(os.getenv("COLOSSUS_BATCH_CONCURRENCY", "1"))))
+    base_port = int(os.getenv("BLENDER_BASE_PORT", "9876"))
+    workers = [asyncio.create_task(worker(base_port + i)) for i in range(num_workers)]
+
+    # Wait for the queue to drain *or* a worker to stop early: a worker that
+    # fails before its loop (e.g. cannot connect to Blender) never takes
+    # another item, so waiting on queue.join() alone could hang forever.
+    drained = asyncio.create_task(queue.join())
+    try:
+        done, _ = await asyncio.wait([drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+        if drained not in done:
+            failed = next(task for task in workers if task in done)
+            raise failed.exception() or RuntimeError("batch worker exited early")
+
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+    finally:
+        drained.cancel()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(drained, *workers, return_exceptions=True)
+
+    results = [results_by_idx[idx] for idx in sorted(results_by_idx)]
 
     # Summary
     print(f"\n{'='*70}")
@@ -158,8 +209,6 @@ async def example_2_batch_processing():
     passed = sum(1 for r in results if r["passed"])
     print(f"\nTotal: {len(results)} ships processed, {passed} passed validation")
 
-    await blender.disconnect()
-
 
 async def example_3_with_vision_evaluation():
     """Example 3: Process with vision-based quality evaluation"""
@@ -261,4 +310,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop's event loop when installed (not available on Windows)
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+
+    run(main())
@@ -10,10 +10,12 @@ Prints recommended repos for 8B and 30B.
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import orjson
 import requests
 
 HF_API_BASE = "https://huggingface.co/api"
@@ -44,6 +46,11 @@ def _auth_headers() -> Dict[str, str]:
     return {"Authorization": f"Bearer {token}"} if token else {}
 
 
+# One pooled session for all requests so repeated searches reuse connections
+SESSION = requests.Session()
+SESSION.headers.update(_auth_headers())
+
+
 @dataclass(frozen=True)
 class Candidate:
     repo_id: str
@@ -51,14 +58,15 @@ class Candidate:
     downloads: int
 
 
-def search_models(query: str, limit: int = 30) -> List[Candidate]:
+def search_models(query: str, limit: int = 10, session: requests.Session = SESSION) -> List[Candidate]:
+    """Return the top `limit` matches, already sorted by downloads server-side."""
     url = f"{HF_API_BASE}/models"
-    params = {"search": query, "limit": str(limit)}
-    r = requests.get(url, params=params, headers=_auth_headers(), timeout=30)
+    params = {"search": query, "limit": str(limit), "sort": "downloads", "direction": "-1"}
+    r = session.get(url, params=params, timeout=30)
     r.raise_for_status()
 
     candidates: List[Candidate] = []
-    for item in r.json():
+    for item in orjson.loads(r.content):
         repo_id = item.get("modelId") or item.get("id")
         if not repo_id:
             continue
@@ -70,7 +78,6 @@ def search_models(query: str, limit: int = 30) -> List[Candidate]:
             )
         )
 
-    candidates.sort(key=lambda c: (c.downloads, c.likes), reverse=True)
     return candidates
 
 
@@ -83,25 +90,35 @@ def pick_best(size: str) -> Dict[str, Optional[str]]:
         f"Qwen3 VL {size} GPTQ",
     ]
 
-    awq: List[Candidate] = []
-    gptq: List[Candidate] = []
+    # Keyed by repo_id: the same repo often matches several query variants.
+    awq: Dict[str, Candidate] = {}
+    gptq: Dict[str, Candidate] = {}
+
+    # Queries are independent; overlap their round-trips.
+    with ThreadPoolExecutor(max_workers=len(queries)) as ex:
+        results = list(ex.map(search_models, queries))
 
-    for q in queries:
-        for c in search_models(q, limit=30):
+    size_marker = size.lower()
+    vl_marker = f"vl-{size_marker}"
+    for found in results:
+        for c in found:
             rid = c.repo_id.lower()
-            if f"vl-{size.lower()}" not in rid and size.lower() not in rid:
+            if vl_marker not in rid and size_marker not in rid:
                 continue
             if "awq" in rid:
-                awq.append(c)
+                awq.setdefault(c.repo_id, c)
             if "gptq" in rid:
-                gptq.append(c)
+                gptq.setdefault(c.repo_id, c)
 
-    awq.sort(key=lambda c: (c.downloads, c.likes), reverse=True)
-    gptq.sort(key=lambda c: (c.downloads, c.likes), reverse=True)
+    def rank(c: Candidate):
+        return (c.downloads, c.likes)
+
+    best_awq = max(awq.values(), key=rank, default=None)
+    best_gptq = max(gptq.values(), key=rank, default=None)
 
     return {
-        "awq": awq[0].repo_id if awq else None,
-        "gptq": gptq[0].repo_id if gptq else None,
+        "awq": best_awq.repo_id if best_awq else None,
+        "gptq": best_gptq.repo_id if best_gptq else None,
     }
 
 
@@ -110,8 +127,11 @@ def main() -> int:
     print("- Uses token from env or .env (if present)")
     print("")
 
-    for size in ("8B", "30B"):
-        picks = pick_best(size)
+    sizes = ("8B", "30B")
+    with ThreadPoolExecutor(max_workers=len(sizes)) as ex:
+        all_picks = list(ex.map(pick_best, sizes))
+
+    for size, picks in zip(sizes, all_picks):
         print(f"Target: Qwen3-VL-{size}")
         print(f"  AWQ:  {picks['awq'] or '<not found>'}")
         print(f"  GPTQ: {picks['gptq'] or '<not found>'}")
@@ -11,16 +11,29 @@ from __future__ import annotations
 import os
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-import requests
+import orjson
+
+if TYPE_CHECKING:
+    import requests
 
 
 HF_API_BASE = "https://huggingface.co/api"
 
+# Repo file listings are cached on disk between runs (set COLOSSUS_HF_CACHE=0
+# to disable, e.g. in CI).
+CACHE_DIR = Path.home() / ".cache" / "colossus" / "hf_siblings"
+CACHE_TTL_S = 6 * 60 * 60
+
 
+@lru_cache(maxsize=1)
 def _read_dotenv_token(dotenv_path: Path) -> Optional[str]:
     if not dotenv_path.exists():
         return None
@@ -38,7 +51,10 @@ def _read_dotenv_token(dotenv_path: Path) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=1)
 def _auth_headers() -> Dict[str, str]:
+    # Resolved once per process; callers copy it (e.g. into session headers)
+    # rather than mutating the cached dict.
     token = (
         os.getenv("HUGGINGFACE_TOKEN")
         or os.getenv("HF_TOKEN")
@@ -54,6 +70,36 @@ def _auth_headers() -> Dict[str, str]:
     return {"Authorization": f"Bearer {token}"}
 
 
+# One pooled session for all requests so lookups reuse keep-alive connections
+# instead of paying a TLS handshake each. The pool is sized for the widest
+# fan-out (two sizes x ten repo lookups); transient errors are retried.
+# Created on first use so importing this module stays cheap.
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            session.headers.update(_auth_headers())
+            session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=20,
+                    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+                ),
+            )
+            _SESSION = session
+        return _SESSION
+
+
 @dataclass(frozen=True)
 class Candidate:
     repo_id: str
@@ -65,9 +111,9 @@ def search_models(query: str, limit: int = 30) -> List[Candidate]:
     url = f"{HF_API_BASE}/models"
     params = {"search": query, "limit": str(limit)}
 
-    r = requests.get(url, params=params, headers=_auth_headers(), timeout=30)
+    r = _get_session().get(url, params=params, timeout=30)
     r.raise_for_status()
-    payload = r.json()
+    payload = orjson.loads(r.content)
 
     candidates: List[Candidate] = []
     for item in payload:
@@ -87,11 +133,49 @@ def search_models(query: str, limit: int = 30) -> List[Candidate]:
     return candidates
 
 
+def _cache_enabled() -> bool:
+    return os.getenv("COLOSSUS_HF_CACHE", "1") != "0"
+
+
+def _read_cached_files(cache_path: Path) -> Optional[List[str]]:
+    try:
+        if time.time() - cache_path.stat().st_mtime > CACHE_TTL_S:
+            return None
+        return orjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_files(cache_path: Path, files: List[str]) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(files))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=512)
 def get_repo_files(repo_id: str) -> List[str]:
+    """List a repo's files; the same repo often shows up for both sizes."""
+    cache_path = CACHE_DIR / f"{repo_id.replace('/', '__')}.json"
+    if _cache_enabled():
+        cached = _read_cached_files(cache_path)
+        if cached is not None:
+            return cached
+
+    files = _fetch_repo_files(repo_id)
+    if _cache_enabled():
+        _write_cached_files(cache_path, files)
+    return files
+
+
+def _fetch_repo_files(repo_id: str) -> List[str]:
     url = f"{HF_API_BASE}/models/{repo_id}"
-    r = requests.get(url, headers=_auth_headers(), timeout=30)
+    r = _get_session().get(url, timeout=30)
     r.raise_for_status()
-    payload = r.json()
+    payload = orjson.loads(r.content)
 
     siblings = payload.get("siblings") or []
     files = []
@@ -102,62 +186,60 @@ def get_repo_files(repo_id: str) -> List[str]:
     return files
 
 
+def _try_get_repo_files(repo_id: str) -> Optional[List[str]]:
+    try:
+        return get_repo_files(repo_id)
+    except Exception:
+        return None
+
+
 def pick_gguf_file(files: List[str], preferred_quant: str) -> Optional[str]:
-    ggufs = [f for f in files if f.lower().endswith(".gguf")]
+    ggufs = [(f, lf) for f in files if (lf := f.lower()).endswith(".gguf")]
     if not ggufs:
         return None
 
-    # Prefer exact quant match first, then partial match.
+    # One pass: prefer the requested quant, then Q4_K_M as a heuristic
+    # fallback, then any gguf; within a tier prefer fewer shards / shorter name.
     preferred_quant_norm = preferred_quant.lower()
-    exact = [f for f in ggufs if preferred_quant_norm in f.lower()]
-    if exact:
-        # prefer smaller shard count / shorter name
-        exact.sort(key=lambda x: (x.count("-"), len(x)))
-        return exact[0]
 
-    # Heuristic fallback: prefer Q4_K_M if available
-    q4km = [f for f in ggufs if "q4_k_m" in f.lower()]
-    if q4km:
-        q4km.sort(key=lambda x: (x.count("-"), len(x)))
-        return q4km[0]
+    def rank(entry: Tuple[str, str]) -> Tuple[int, int, int]:
+        f, lf = entry
+        tier = 0 if preferred_quant_norm in lf else 1 if "q4_k_m" in lf else 2
+        return (tier, f.count("-"), len(f))
 
-    # Otherwise take the first gguf
-    ggufs.sort(key=lambda x: (x.count("-"), len(x)))
-    return ggufs[0]
+    return min(ggufs, key=rank)[0]
 
 
 def find_best_repo(size: str) -> Tuple[Optional[str], Optional[str]]:
-    # Try multiple searches because naming isn’t consistent.
-    search_terms = [
-        f"Qwen3-VL-{size} GGUF",
-        f"Qwen3 VL {size} GGUF",
-        f"Qwen3-VL-{size}-Instruct GGUF",
-    ]
+    # One substring search covers the "Qwen3-VL-{size}" and
+    # "Qwen3-VL-{size}-Instruct" spellings; GGUF is filtered locally.
+    size_marker = size.lower()
+    vl_marker = f"vl-{size_marker}"
 
     candidates: List[Candidate] = []
-    seen = set()
-    for term in search_terms:
-        for c in search_models(term, limit=30):
-            if c.repo_id in seen:
-                continue
-            seen.add(c.repo_id)
-            # Filter to plausible repos
-            if "gguf" not in c.repo_id.lower():
-                continue
-            if f"vl-{size}".lower() not in c.repo_id.lower() and f"{size}" not in c.repo_id.lower():
-                continue
-            candidates.append(c)
+    for c in search_models(f"Qwen3-VL-{size}", limit=90):
+        # Filter to plausible repos
+        rid = c.repo_id.lower()
+        if "gguf" not in rid:
+            continue
+        if vl_marker not in rid and size_marker not in rid:
+            continue
+        candidates.append(c)
 
-    candidates.sort(key=lambda c: (c.downloads, c.likes), reverse=True)
+    # search_models already ranks by downloads/likes; filtering keeps that order.
     if not candidates:
         return None, None
 
     preferred_quant = os.getenv("QWEN3_GGUF_QUANT", "Q4_K_M")
 
-    for c in candidates[:10]:
-        try:
-            files = get_repo_files(c.repo_id)
-        except Exception:
+    # Fetch the top candidates' file lists concurrently, then take the first
+    # one (in ranking order) that has a usable GGUF.
+    top = candidates[:10]
+    with ThreadPoolExecutor(max_workers=len(top)) as ex:
+        file_lists = list(ex.map(_try_get_repo_files, [c.repo_id for c in top]))
+
+    for c, files in zip(top, file_lists):
+        if files is None:
             continue
 
         chosen = pick_gguf_file(files, preferred_quant=preferred_quant)
@@ -168,15 +250,17 @@ def find_best_repo(size: str) -> Tuple[Optional[str], Optional[str]]:
 
 
 def main() -> int:
-    sizes = ["8B", "30B"]
+    sizes = ("8B", "30B")
 
     print("Hugging Face Qwen3-VL GGUF finder")
     print("- Uses token from env or .env (if present)")
     print("- Set QWEN3_GGUF_QUANT to override (default: Q4_K_M)")
     print("")
 
-    for size in sizes:
-        repo, gguf = find_best_repo(size)
+    with ThreadPoolExecutor(max_workers=len(sizes)) as ex:
+        found = list(ex.map(find_best_repo, sizes))
+
+    for size, (repo, gguf) in zip(sizes, found):
         print(f"Target: Qwen3-VL-{size}")
         if not repo:
             print("  Repo: <not found>")
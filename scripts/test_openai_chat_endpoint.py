@@ -1,18 +1,20 @@
 """Smoke-test an OpenAI-compatible chat endpoint.
 
 Usage:
-  python scripts/test_openai_chat_endpoint.py http://127.0.0.1:8000/v1 MODEL_ID
+  python scripts/test_openai_chat_endpoint.py http://127.0.0.1:8000/v1 MODEL_ID [--verbose]
 
 If MODEL_ID is omitted, it will try to infer one from /models.
+Only a short preview of the response body is printed unless --verbose is given.
 """
 
 from __future__ import annotations
 
+import argparse
 import json
-import sys
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import requests
+if TYPE_CHECKING:
+    import requests
 
 
 def normalize(endpoint: str) -> str:
@@ -20,8 +22,8 @@ def normalize(endpoint: str) -> str:
     return endpoint if endpoint.endswith("/v1") else endpoint + "/v1"
 
 
-def get_models(endpoint: str) -> List[str]:
-    r = requests.get(f"{endpoint}/models", timeout=15)
+def get_models(session: requests.Session, endpoint: str) -> List[str]:
+    r = session.get(f"{endpoint}/models", timeout=15)
     if r.status_code != 200:
         return []
     payload = r.json()
@@ -34,7 +36,7 @@ def get_models(endpoint: str) -> List[str]:
     return ids
 
 
-def chat(endpoint: str, model: str) -> Dict[str, Any]:
+def chat(session: requests.Session, endpoint: str, model: str) -> Dict[str, Any]:
     payload = {
         "model": model,
         "messages": [
@@ -44,30 +46,41 @@ def chat(endpoint: str, model: str) -> Dict[str, Any]:
         "temperature": 0.0,
         "max_tokens": 16,
     }
-    r = requests.post(f"{endpoint}/chat/completions", json=payload, timeout=60)
+    r = session.post(f"{endpoint}/chat/completions", json=payload, timeout=60)
     return {"status": r.status_code, "body": r.text}
 
 
 def main() -> int:
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/test_openai_chat_endpoint.py ENDPOINT [/v1] [MODEL_ID]")
-        return 2
+    parser = argparse.ArgumentParser(description="Smoke-test an OpenAI-compatible chat endpoint.")
+    parser.add_argument("endpoint", help="Base URL, with or without /v1")
+    parser.add_argument("model", nargs="?", help="Model ID (default: first from /models)")
+    parser.add_argument("--verbose", action="store_true", help="Print the full response body")
+    args = parser.parse_args()
 
-    endpoint = normalize(sys.argv[1])
-    model = sys.argv[2] if len(sys.argv) >= 3 else None
+    # Imported after argument parsing so --help and usage errors stay instant.
+    import requests
 
-    models = get_models(endpoint)
-    if not model:
-        model = models[0] if models else None
+    endpoint = normalize(args.endpoint)
+    model = args.model
 
-    print(json.dumps({"endpoint": endpoint, "models": models, "selected_model": model}, indent=2))
+    # Keep one connection open for both calls instead of reconnecting.
+    with requests.Session() as session:
+        models = get_models(session, endpoint)
+        if not model:
+            model = models[0] if models else None
 
-    if not model:
-        print("No model ID available; /models missing or empty.")
-        return 3
+        print(json.dumps({"endpoint": endpoint, "models": models, "selected_model": model}, indent=2))
 
-    res = chat(endpoint, model)
-    print(json.dumps(res, indent=2))
+        if not model:
+            print("No model ID available; /models missing or empty.")
+            return 3
+
+        res = chat(session, endpoint, model)
+
+    if args.verbose:
+        print(json.dumps(res, indent=2))
+    else:
+        print(json.dumps({"status": res["status"], "body_preview": res["body"][:200]}, indent=2))
     return 0 if res["status"] == 200 else 1
 
 
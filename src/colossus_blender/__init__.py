@@ -5,45 +5,100 @@ Multi-agent vision-based 3D scene creation with Blender
 Uses GLM-4.5V from Z.AI for vision-based scene evaluation
 """
 
-from .orchestrator import (
-    ColossusD5Orchestrator,
-    WorkflowState,
-    PlannerAgent,
-    DesignerAgent,
-    ExecutorAgent,
-    EvaluatorAgent,
-    RefinerAgent,
-    create_scene_iteratively
-)
-
-from .mcp_client import (
-    BlenderMCPClient,
-    BlenderConfig,
-    ConnectionMode,
-    MCPToolCaller,
-    create_blender_client
-)
-
-from .gpu_config import (
-    GPUConfigurator,
-    GPUModel,
-    GPUSpecs,
-    RenderSettings,
-    get_gpu_config,
-    compare_gpus
-)
-
-from .glm_vision import (
-    GLMVisionClient,
-    GLMConfig,
-    evaluate_screenshot_with_glm
-)
-
-from .vision_evaluator import (
-    ComparisonVisionClient,
-    VisionModelConfig,
-    evaluate_screenshot_with_local_vision
-)
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .orchestrator import (
+        ColossusD5Orchestrator,
+        WorkflowState,
+        PlannerAgent,
+        DesignerAgent,
+        ExecutorAgent,
+        EvaluatorAgent,
+        RefinerAgent,
+        create_scene_iteratively
+    )
+
+    from .mcp_client import (
+        BlenderMCPClient,
+        BlenderConfig,
+        ConnectionMode,
+        MCPToolCaller,
+        create_blender_client
+    )
+
+    from .gpu_config import (
+        GPUConfigurator,
+        GPUModel,
+        GPUSpecs,
+        RenderSettings,
+        get_gpu_config,
+        compare_gpus
+    )
+
+    from .glm_vision import (
+        GLMVisionClient,
+        GLMConfig,
+        GLMAPIError,
+        evaluate_screenshot_with_glm
+    )
+
+    from .vision_evaluator import (
+        ComparisonVisionClient,
+        VisionModelConfig,
+        evaluate_screenshot_with_local_vision
+    )
+
+    from .game_asset_config import (
+        GameAssetProfile,
+        GameEngine,
+        get_profile
+    )
+
+    from .game_asset_agent import (
+        GameAssetAgent,
+        GameAssetMetadata,
+        process_battleship_mesh
+    )
+
+# Public names -> defining submodule. Submodules are imported on first
+# attribute access (PEP 562), so e.g. `from colossus_blender import get_gpu_config`
+# doesn't pull in the LLM/vision stacks the orchestrator and evaluators need.
+_LAZY_IMPORTS = {
+    "ColossusD5Orchestrator": "orchestrator",
+    "WorkflowState": "orchestrator",
+    "PlannerAgent": "orchestrator",
+    "DesignerAgent": "orchestrator",
+    "ExecutorAgent": "orchestrator",
+    "EvaluatorAgent": "orchestrator",
+    "RefinerAgent": "orchestrator",
+    "create_scene_iteratively": "orchestrator",
+    "BlenderMCPClient": "mcp_client",
+    "BlenderConfig": "mcp_client",
+    "ConnectionMode": "mcp_client",
+    "MCPToolCaller": "mcp_client",
+    "create_blender_client": "mcp_client",
+    "GPUConfigurator": "gpu_config",
+    "GPUModel": "gpu_config",
+    "GPUSpecs": "gpu_config",
+    "RenderSettings": "gpu_config",
+    "get_gpu_config": "gpu_config",
+    "compare_gpus": "gpu_config",
+    "GLMVisionClient": "glm_vision",
+    "GLMConfig": "glm_vision",
+    "GLMAPIError": "glm_vision",
+    "evaluate_screenshot_with_glm": "glm_vision",
+    "ComparisonVisionClient": "vision_evaluator",
+    "VisionModelConfig": "vision_evaluator",
+    "evaluate_screenshot_with_local_vision": "vision_evaluator",
+    "GameAssetProfile": "game_asset_config",
+    "GameEngine": "game_asset_config",
+    "get_profile": "game_asset_config",
+    "GameAssetAgent": "game_asset_agent",
+    "GameAssetMetadata": "game_asset_agent",
+    "process_battleship_mesh": "game_asset_agent",
+}
 
 __version__ = "0.3.0"
 __author__ = "Colossus Team"
@@ -78,8 +133,30 @@ __all__ = [
     # Vision Models
     "GLMVisionClient",  # Legacy GLM-4.5V (for backward compatibility)
     "GLMConfig",
+    "GLMAPIError",
     "evaluate_screenshot_with_glm",
     "ComparisonVisionClient",  # New local Qwen2.5-VL
     "VisionModelConfig",
     "evaluate_screenshot_with_local_vision",
+
+    # Game Assets
+    "GameAssetProfile",
+    "GameEngine",
+    "get_profile",
+    "GameAssetAgent",
+    "GameAssetMetadata",
+    "process_battleship_mesh",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,12 +4,18 @@ Transforms Blender scenes/meshes into game-ready assets with LODs, UVs, PBR mate
 """
 
 import os
-import json
+import re
 import asyncio
+import textwrap
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from string import Template
+
+import orjson
 
 from .game_asset_config import (
     GameAssetProfile,
@@ -42,6 +48,7 @@ class GameAssetMetadata:
 
     # Export info
     fbx_path: Optional[str] = None
+    lod_fbx_paths: List[str] = field(default_factory=list)
     texture_dir: Optional[str] = None
 
     # Quality metrics
@@ -54,6 +61,413 @@ class GameAssetMetadata:
     validation_issues: List[str] = field(default_factory=list)
 
 
+# Scripts print their JSON result between these markers
+_RESULT_RE = re.compile(r"###RESULT###(.*?)###END###", re.S)
+
+
+# Stage script templates; only the profile-dependent fields are substituted
+_IMPORT_SCRIPT_TEMPLATES: Dict[str, Template] = {
+    ".obj": Template('''
+import bpy
+
+# Clear existing mesh objects
+bpy.ops.object.select_all(action='SELECT')
+bpy.ops.object.delete()
+
+# Import OBJ
+bpy.ops.import_scene.obj(filepath=$path)
+
+result = {"format": "OBJ"}
+'''),
+    ".fbx": Template('''
+import bpy
+
+bpy.ops.object.select_all(action='SELECT')
+bpy.ops.object.delete()
+
+bpy.ops.import_scene.fbx(filepath=$path)
+
+result = {"format": "FBX"}
+'''),
+    # For .blend files, append objects
+    ".blend": Template('''
+import bpy
+
+bpy.ops.object.select_all(action='SELECT')
+bpy.ops.object.delete()
+
+# Append all objects from .blend file
+with bpy.data.libraries.load($path) as (data_from, data_to):
+    data_to.objects = data_from.objects
+
+for obj in data_to.objects:
+    if obj is not None:
+        bpy.context.collection.objects.link(obj)
+
+result = {"format": "BLEND"}
+'''),
+}
+
+_EXPORT_SCRIPT_TEMPLATE = Template('''
+import bpy
+
+# Select all LOD objects
+bpy.ops.object.select_all(action='DESELECT')
+for obj in bpy.data.objects:
+    if obj.name.startswith("LOD"):
+        obj.select_set(True)
+
+# Export FBX
+output_path = $output_path
+bpy.ops.export_scene.fbx(
+    filepath=output_path,
+    use_selection=True,
+    object_types={'MESH'},
+    apply_scale_options='FBX_SCALE_ALL',
+    axis_forward=$axis_forward,
+    axis_up=$axis_up,
+    bake_anim=$bake_anim,
+    path_mode=$path_mode,
+    embed_textures=$embed_textures
+)
+
+result = {
+    "fbx_path": output_path,
+    "texture_dir": $texture_dir
+}
+''')
+
+_CLEANUP_SCRIPT_TEMPLATE = Template('''
+import bpy
+import numpy as np
+
+obj = bpy.context.active_object
+if obj and obj.type == 'MESH':
+    # Enter edit mode
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.select_all(action='SELECT')
+
+    # Remove doubles
+    bpy.ops.mesh.remove_doubles(threshold=0.0001)
+
+    # Dissolve degenerate edges
+    bpy.ops.mesh.dissolve_degenerate(threshold=0.0001)
+
+    # Convert n-gons to triangles/quads if needed
+    $quads_op
+
+    # Recalculate normals
+    bpy.ops.mesh.normals_make_consistent(inside=False)
+
+    # Exit edit mode
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    # Get updated stats
+    mesh = obj.data
+
+    # Polygon sizes in one foreach_get, counted in one bincount pass
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    size_counts = np.bincount(loop_totals, minlength=5)
+    tri_count = int(size_counts[3])
+    quad_count = int(size_counts[4])
+    ngon_count = len(mesh.polygons) - tri_count - quad_count
+
+    quality_score = 1.0
+    if ngon_count > 0 and not $allow_ngons:
+        quality_score -= 0.3
+    if tri_count > quad_count and $prefer_quads:
+        quality_score -= 0.2
+
+    result = {
+        "ngons": ngon_count,
+        "tris": tri_count,
+        "quads": quad_count,
+        "quality_score": max(0.0, quality_score)
+    }
+else:
+    result = {"error": "No active mesh"}
+''')
+
+_UNWRAP_SCRIPT_TEMPLATE = Template('''
+import bpy
+import math
+import numpy as np
+
+obj = bpy.context.active_object
+if obj and obj.type == 'MESH':
+    # Enter edit mode
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.select_all(action='SELECT')
+
+    # Smart UV Project
+    bpy.ops.uv.smart_project(
+        angle_limit=math.radians(66.0),
+        island_margin=0.02,
+        area_weight=1.0
+    )
+
+    # Pack UV islands
+    bpy.ops.uv.pack_islands(margin=0.01)
+
+    # Exit edit mode
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+    # Calculate UV coverage
+    mesh = obj.data
+    if mesh.uv_layers:
+        uv_layer = mesh.uv_layers.active.data
+
+        # Coverage = total area of the UV polygons, i.e. the fraction of
+        # the 0-1 square used by the packed islands (shoelace formula over
+        # each polygon's loops, summed per polygon with reduceat)
+        uvs = np.empty(len(uv_layer) * 2, dtype=np.float32)
+        uv_layer.foreach_get("uv", uvs)
+        u, v = uvs[0::2].astype(np.float64), uvs[1::2].astype(np.float64)
+
+        poly_count = len(mesh.polygons)
+        loop_start = np.empty(poly_count, dtype=np.int32)
+        loop_total = np.empty(poly_count, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_start)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+
+        coverage = 0.0
+        if poly_count:
+            # Each loop's successor within its polygon (last wraps to first)
+            nxt = np.arange(1, len(u) + 1)
+            nxt[loop_start + loop_total - 1] = loop_start
+            cross = u * v[nxt] - u[nxt] * v
+            areas = 0.5 * np.abs(np.add.reduceat(cross, loop_start))
+            coverage = min(1.0, float(areas.sum()))  # Overlaps can exceed 1
+
+        # Count islands (approximate)
+        islands = len(mesh.uv_layers)
+
+        quality_score = coverage
+        if coverage < $min_uv_coverage:
+            quality_score *= 0.7
+
+        result = {
+            "coverage": coverage,
+            "islands": islands,
+            "quality_score": quality_score
+        }
+    else:
+        result = {
+            "coverage": 0.0,
+            "islands": 0,
+            "quality_score": 0.0,
+            "error": "No UV layer created"
+        }
+else:
+    result = {"error": "No active mesh"}
+''')
+
+_MATERIALS_SCRIPT_TEMPLATE = Template('''
+import bpy
+
+obj = bpy.context.active_object
+if obj and obj.type == 'MESH':
+    materials_created = []
+
+    # (name, base_color, metallic, roughness) per profile material
+    for name, base_color, metallic, roughness in $material_specs:
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+        bsdf = mat.node_tree.nodes.get("Principled BSDF")
+        if bsdf:
+            bsdf.inputs['Base Color'].default_value = base_color
+            bsdf.inputs['Metallic'].default_value = metallic
+            bsdf.inputs['Roughness'].default_value = roughness
+        materials_created.append(mat.name)
+
+    # Assign first material to object if it has none
+    if len(obj.material_slots) == 0 and materials_created:
+        mat_name = materials_created[0]
+        mat = bpy.data.materials.get(mat_name)
+        if mat:
+            obj.data.materials.append(mat)
+
+    result = {"materials": materials_created}
+else:
+    result = {"materials": [], "error": "No active mesh"}
+''')
+
+_LOD_SCRIPT_TEMPLATE = Template('''
+import bpy
+import math
+import numpy as np
+
+obj = bpy.context.active_object
+if obj and obj.type == 'MESH':
+    lod_stats = {}
+    lod_objects = []
+
+    # LOD0 is the original object
+    obj.name = "LOD0"
+    mesh = obj.data
+    lod_stats["LOD0"] = len(mesh.loops) - 2 * len(mesh.polygons)
+
+    # Create additional LODs, each decimated from the previous (smaller) one
+    source = obj
+$lod_blocks
+    result = {
+        "lod_count": $lod_count,
+        "lod0_triangles": lod_stats.get("LOD0", 0),
+        "lod_stats": lod_stats,
+        "lod_objects": lod_objects
+    }
+else:
+    result = {"lod_count": 0, "error": "No active mesh"}
+''')
+
+_LOD_BLOCK_TEMPLATE = Template('''
+    # Create LOD$i
+    lod_obj = source.copy()
+    lod_obj.data = source.data.copy()
+    lod_obj.name = "LOD$i"
+    bpy.context.collection.objects.link(lod_obj)
+
+    # Add Decimate modifier
+$decimate
+
+    # Apply modifier
+    bpy.context.view_layer.objects.active = lod_obj
+    bpy.ops.object.modifier_apply(modifier="Decimate_LOD$i")
+
+    # Get stats
+    lod_stats["LOD$i"] = len(lod_obj.data.loops) - 2 * len(lod_obj.data.polygons)
+    lod_objects.append("LOD$i")
+    source = lod_obj
+''')
+
+# LODs below this ratio (of LOD0) are welded on a grid-sized radius rather
+# than collapsed: far LODs don't need QEM quality, and the collapse is the
+# slowest part of generating them
+_CLUSTER_DECIMATE_RATIO = 0.1
+
+# Both snippets decimate `lod_obj` by `$ratio` of its current triangles
+_COLLAPSE_DECIMATE_TEMPLATE = Template('''
+decimate = lod_obj.modifiers.new(name=$modifier_name, type='DECIMATE')
+decimate.ratio = $ratio
+decimate.use_collapse_triangulate = True
+''')
+
+_CLUSTER_DECIMATE_TEMPLATE = Template('''
+# Welding a surface of area A at spacing s leaves about 2*A/s^2 triangles
+areas = np.empty(len(lod_obj.data.polygons), dtype=np.float32)
+lod_obj.data.polygons.foreach_get("area", areas)
+target = max(1.0, $ratio * (len(lod_obj.data.loops) - 2 * len(lod_obj.data.polygons)))
+decimate = lod_obj.modifiers.new(name=$modifier_name, type='WELD')
+decimate.merge_threshold = math.sqrt(2.0 * float(areas.sum()) / target)
+''')
+
+# Background LOD decimation: LOD0 is saved from the MCP session, each LOD is
+# decimated from it in its own headless Blender, then appended back
+_LOD0_SAVE_TEMPLATE = Template('''
+import bpy
+
+obj = bpy.context.active_object
+if obj and obj.type == 'MESH':
+    # LOD0 is the original object
+    obj.name = "LOD0"
+    bpy.data.libraries.write($path, {obj}, fake_user=True)
+    result = {"saved": True, "triangles": len(obj.data.loops) - 2 * len(obj.data.polygons)}
+else:
+    result = {"error": "No active mesh"}
+''')
+
+_BACKGROUND_DECIMATE_TEMPLATE = Template('''
+import bpy
+import json
+import math
+import numpy as np
+
+with bpy.data.libraries.load($source_path) as (data_from, data_to):
+    data_to.objects = ["LOD0"]
+lod_obj = data_to.objects[0]
+bpy.context.collection.objects.link(lod_obj)
+
+$decimate
+
+# Bake the modifier into a new mesh; no operator context needed headless
+depsgraph = bpy.context.evaluated_depsgraph_get()
+lod_obj.data = bpy.data.meshes.new_from_object(lod_obj.evaluated_get(depsgraph))
+lod_obj.modifiers.clear()
+lod_obj.name = $lod_name
+
+bpy.data.libraries.write($output_path, {lod_obj}, fake_user=True)
+
+triangles = len(lod_obj.data.loops) - 2 * len(lod_obj.data.polygons)
+print("###RESULT###")
+print(json.dumps({"triangles": triangles}))
+print("###END###")
+''')
+
+_LOD_APPEND_TEMPLATE = Template('''
+import bpy
+
+obj = bpy.data.objects.get("LOD0")
+if obj and obj.type == 'MESH':
+    lod_stats = {}
+    lod_objects = []
+
+    lod_stats["LOD0"] = len(obj.data.loops) - 2 * len(obj.data.polygons)
+
+    for lod_name, path in $lod_files:
+        with bpy.data.libraries.load(path) as (data_from, data_to):
+            data_to.objects = [lod_name]
+        lod_obj = data_to.objects[0]
+        lod_obj.name = lod_name
+        bpy.context.collection.objects.link(lod_obj)
+
+        # Share LOD0's materials instead of the appended copies
+        for slot, mat in enumerate(obj.data.materials[:len(lod_obj.data.materials)]):
+            lod_obj.data.materials[slot] = mat
+
+        lod_stats[lod_name] = len(lod_obj.data.loops) - 2 * len(lod_obj.data.polygons)
+        lod_objects.append(lod_name)
+
+    result = {
+        "lod_count": len(lod_stats),
+        "lod0_triangles": lod_stats["LOD0"],
+        "lod_stats": lod_stats,
+        "lod_objects": lod_objects
+    }
+else:
+    result = {"lod_count": 0, "error": "No LOD0 mesh"}
+''')
+
+_BACKGROUND_EXPORT_TEMPLATE = Template('''
+import bpy
+import json
+
+# Drop the factory scene so only this LOD is exported
+for default_obj in list(bpy.data.objects):
+    bpy.data.objects.remove(default_obj)
+
+with bpy.data.libraries.load($source_path) as (data_from, data_to):
+    data_to.objects = [$lod_name]
+obj = data_to.objects[0]
+bpy.context.collection.objects.link(obj)
+
+bpy.ops.export_scene.fbx(
+    filepath=$output_path,
+    object_types={'MESH'},
+    apply_scale_options='FBX_SCALE_ALL',
+    axis_forward=$axis_forward,
+    axis_up=$axis_up,
+    bake_anim=$bake_anim,
+    path_mode=$path_mode,
+    embed_textures=$embed_textures
+)
+
+print("###RESULT###")
+print(json.dumps({"fbx_path": $output_path}))
+print("###END###")
+''')
+
+
 class GameAssetAgent:
     """
     Converts Blender scenes/meshes into game-ready assets
@@ -64,7 +478,8 @@ class GameAssetAgent:
     3. UV unwrapping (Smart UV project + optimization)
     4. PBR material generation (naval-specific materials)
     5. Normal map baking (high-poly to low-poly)
-    6. LOD generation (4 levels with Decimate modifier)
+    6. LOD generation (4 levels with Decimate modifier; optionally in
+       parallel headless Blender processes)
     7. FBX export (game engine compatible)
     8. Quality validation
     """
@@ -73,12 +488,23 @@ class GameAssetAgent:
         self,
         blender_mcp_client,
         output_dir: Path = Path("./outputs/game_assets"),
-        vision_client=None
+        vision_client=None,
+        blender_executable: Optional[str] = None,
+        stage_timeout: float = 30.0
     ):
         self.blender_mcp = blender_mcp_client
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.vision_client = vision_client  # Optional: for quality evaluation
+        # Optional: decimate LODs in parallel headless Blender processes
+        # (must run on the same machine as the MCP-connected Blender)
+        self.blender_executable = blender_executable
+        # Seconds allowed per fused stage; a pipeline call waits this long
+        # for every stage it runs, since they all share one reply
+        self.stage_timeout = stage_timeout
+        # Each headless Blender is single-threaded and CPU-bound, so run at
+        # most one per core (shared with the agents process_meshes creates)
+        self._background_slots = asyncio.Semaphore(os.cpu_count() or 1)
 
     async def process_mesh(
         self,
@@ -103,6 +529,18 @@ class GameAssetAgent:
         if asset_name is None:
             asset_name = input_mesh_path.stem
 
+        metadata = await self._run_blender_stages(input_mesh_path, profile, asset_name)
+        await self._finish_asset(profile, metadata)
+
+        return metadata
+
+    async def _run_blender_stages(
+        self,
+        input_mesh_path: Path,
+        profile: GameAssetProfile,
+        asset_name: str
+    ) -> GameAssetMetadata:
+        """Stages 1-7: everything that needs this agent's Blender instance"""
         print(f"[GameAssetAgent] Processing: {asset_name}")
         print(f"[GameAssetAgent] Profile: {profile.name}")
         print(f"[GameAssetAgent] Input: {input_mesh_path}")
@@ -112,22 +550,67 @@ class GameAssetAgent:
             profile_name=profile.name
         )
 
+        # Every stage that touches Blender runs as one fused script, so the
+        # whole pipeline costs a single MCP round-trip (two when LODs are
+        # decimated in background Blender processes)
+        print(f"\n[1-7/8] Running Blender pipeline...")
+        prepare_stages = [
+            ("import", self._import_script(input_mesh_path)),
+            ("stats", self._mesh_stats_script()),
+            ("cleanup", self._cleanup_script(profile)),
+            ("uvs", self._unwrap_script(profile)),
+            ("materials", self._materials_script(profile)),
+        ]
+        export_stage = ("export", self._export_script(
+            self.output_dir / f"{asset_name}.fbx",
+            self.output_dir / f"{asset_name}_textures",
+            profile
+        ))
+
+        if self.blender_executable is None:
+            stages = await self._run_pipeline(
+                prepare_stages + [("lods", self._lod_script(profile)), export_stage]
+            )
+        else:
+            import tempfile  # Only the background-LOD path needs a scratch dir
+
+            with tempfile.TemporaryDirectory(prefix=f"{asset_name}_lods_") as work_dir:
+                lod0_path = Path(work_dir) / "LOD0.blend"
+                stages = await self._run_pipeline(
+                    prepare_stages + [("lod0", _LOD0_SAVE_TEMPLATE.substitute(path=repr(str(lod0_path))))]
+                )
+                lod_files = []
+                if "error" not in stages.get("lod0", {}):
+                    lod_files = await self._decimate_lods_in_background(profile, lod0_path)
+                if profile.export_settings.get("split_lod_files") and lod_files:
+                    # LOD0 and every decimated LOD are already on disk, so
+                    # the exports need no further MCP round-trip
+                    lod0 = ("LOD0", lod0_path, stages["lod0"].get("triangles", 0))
+                    stages.update(await self._export_lods_in_background(
+                        asset_name, profile, [lod0] + lod_files
+                    ))
+                else:
+                    stages.update(await self._run_pipeline([
+                        ("lods", _LOD_APPEND_TEMPLATE.substitute(
+                            lod_files=repr([(name, str(path)) for name, path, _ in lod_files])
+                        )),
+                        export_stage,
+                    ]))
+
         # Stage 1: Import mesh
-        print(f"\n[1/8] Importing mesh...")
-        await self._import_mesh(input_mesh_path)
-        original_stats = await self._get_mesh_stats()
-        metadata.original_triangles = original_stats.get("triangles", 0)
+        print(f"\n[1/8] Imported mesh")
+        metadata.original_triangles = stages.get("stats", {}).get("triangles", 0)
         print(f"  Original triangles: {metadata.original_triangles:,}")
 
         # Stage 2: Topology cleanup
-        print(f"\n[2/8] Cleaning up topology...")
-        topology_result = await self._cleanup_topology(profile)
+        print(f"\n[2/8] Cleaned up topology")
+        topology_result = stages.get("cleanup", {})
         metadata.topology_quality = topology_result.get("quality_score", 0.0)
         print(f"  Topology quality: {metadata.topology_quality:.1%}")
 
         # Stage 3: UV unwrapping
-        print(f"\n[3/8] UV unwrapping...")
-        uv_result = await self._unwrap_uvs(profile)
+        print(f"\n[3/8] UV unwrapped")
+        uv_result = stages.get("uvs", {})
         metadata.uv_coverage = uv_result.get("coverage", 0.0)
         metadata.uv_islands = uv_result.get("islands", 0)
         metadata.uv_quality = uv_result.get("quality_score", 0.0)
@@ -135,8 +618,8 @@ class GameAssetAgent:
         print(f"  UV islands: {metadata.uv_islands}")
 
         # Stage 4: PBR materials
-        print(f"\n[4/8] Generating PBR materials...")
-        material_result = await self._generate_pbr_materials(profile)
+        print(f"\n[4/8] Generated PBR materials")
+        material_result = stages.get("materials", {})
         metadata.materials_created = material_result.get("materials", [])
         print(f"  Materials created: {len(metadata.materials_created)}")
 
@@ -150,8 +633,8 @@ class GameAssetAgent:
             print(f"  Skipped (no high-poly source)")
 
         # Stage 6: LOD generation
-        print(f"\n[6/8] Generating LOD levels...")
-        lod_result = await self._generate_lods(profile)
+        print(f"\n[6/8] Generated LOD levels")
+        lod_result = stages.get("lods", {})
         metadata.lod_count = lod_result.get("lod_count", 0)
         metadata.lod0_triangles = lod_result.get("lod0_triangles", 0)
         print(f"  LOD levels created: {metadata.lod_count}")
@@ -159,16 +642,22 @@ class GameAssetAgent:
             print(f"    {lod_name}: {tris:,} triangles")
 
         # Stage 7: Export FBX
-        print(f"\n[7/8] Exporting FBX...")
-        export_result = await self._export_game_asset(
-            asset_name=asset_name,
-            profile=profile
-        )
+        print(f"\n[7/8] Exported FBX")
+        export_result = stages.get("export", {})
         metadata.fbx_path = export_result.get("fbx_path")
+        metadata.lod_fbx_paths = export_result.get("lod_fbx_paths", [])
         metadata.texture_dir = export_result.get("texture_dir")
         print(f"  FBX exported: {metadata.fbx_path}")
         print(f"  Textures: {metadata.texture_dir}")
 
+        return metadata
+
+    async def _finish_asset(
+        self,
+        profile: GameAssetProfile,
+        metadata: GameAssetMetadata
+    ):
+        """Stage 8 and metadata save: host-side only, Blender is not needed"""
         # Stage 8: Validation
         print(f"\n[8/8] Validating asset...")
         validation_result = await self._validate_game_asset(profile, metadata)
@@ -186,273 +675,196 @@ class GameAssetAgent:
         print(f"\n[GameAssetAgent] Overall quality: {metadata.overall_quality:.1%}")
         print(f"[GameAssetAgent] Processing complete!")
 
-        # Save metadata
-        metadata_path = self.output_dir / f"{asset_name}_metadata.json"
-        self._save_metadata(metadata, metadata_path)
+        # Save metadata (file write off the event loop)
+        metadata_path = self.output_dir / f"{metadata.asset_name}_metadata.json"
+        await asyncio.to_thread(self._save_metadata, metadata, metadata_path)
 
-        return metadata
+    async def process_meshes(
+        self,
+        input_mesh_paths: List[Path],
+        profile: GameAssetProfile,
+        blender_mcp_clients: Optional[List[Any]] = None
+    ) -> List[GameAssetMetadata]:
+        """
+        Process several mesh files concurrently
 
-    async def _import_mesh(self, mesh_path: Path):
-        """Import mesh into Blender"""
-        extension = mesh_path.suffix.lower()
+        Every stage rebuilds the open Blender scene, so meshes only run in
+        parallel on separate Blender instances: each client handles one mesh
+        at a time, which caps concurrency at the number of clients. A client
+        is handed to the next mesh as soon as the Blender stages are done,
+        overlapping validation and the metadata write with the next import.
+        The first failing mesh cancels the rest, so no mesh is still using a
+        client when the error reaches the caller.
 
-        if extension == ".obj":
-            import_code = f'''
-import bpy
+        Args:
+            input_mesh_paths: Paths to input OBJ/FBX/BLEND files
+            profile: Game asset profile applied to every mesh
+            blender_mcp_clients: Connected clients to share out (defaults to
+                this agent's client, i.e. sequential processing)
 
-# Clear existing mesh objects
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
+        Returns:
+            GameAssetMetadata for each input, in input order
 
-# Import OBJ
-bpy.ops.import_scene.obj(filepath=r"{mesh_path}")
+        Raises:
+            ValueError: If two inputs share a file stem, since each asset's
+                outputs are named after it
+        """
+        mesh_paths = [Path(mesh_path) for mesh_path in input_mesh_paths]
+        stems = Counter(mesh_path.stem for mesh_path in mesh_paths)
+        duplicates = sorted(stem for stem, count in stems.items() if count > 1)
+        if duplicates:
+            raise ValueError(
+                f"Input meshes share file stems {duplicates}; their outputs would overwrite each other"
+            )
 
-print("OBJ import successful")
-'''
-        elif extension == ".fbx":
-            import_code = f'''
-import bpy
+        # One agent per client; waiting for a free agent is the back-pressure
+        idle_agents: asyncio.Queue = asyncio.Queue()
+        for client in blender_mcp_clients or [self.blender_mcp]:
+            if client is self.blender_mcp:
+                idle_agents.put_nowait(self)
+            else:
+                agent = GameAssetAgent(
+                    blender_mcp_client=client,
+                    output_dir=self.output_dir,
+                    vision_client=self.vision_client,
+                    blender_executable=self.blender_executable,
+                    stage_timeout=self.stage_timeout
+                )
+                agent._background_slots = self._background_slots
+                idle_agents.put_nowait(agent)
+
+        async def run(mesh_path: Path) -> GameAssetMetadata:
+            agent = await idle_agents.get()
+            try:
+                metadata = await agent._run_blender_stages(mesh_path, profile, mesh_path.stem)
+            finally:
+                idle_agents.put_nowait(agent)
+
+            # The next mesh can already import on this Blender instance while
+            # this one is validated and its metadata written
+            await agent._finish_asset(profile, metadata)
+            return metadata
+
+        tasks = [asyncio.create_task(run(mesh_path)) for mesh_path in mesh_paths]
+        if not tasks:
+            return []
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for task in tasks:
+            if task in done and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        return [task.result() for task in tasks]
+
+    async def _run_pipeline(
+        self,
+        stages: List[Tuple[str, str]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run (name, script body) Blender stages in one execute_code call
 
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
+        Returns:
+            Result dict per stage, keyed by stage name
+        """
+        script = self._build_pipeline_script(stages)
 
-bpy.ops.import_scene.fbx(filepath=r"{mesh_path}")
+        result = await self.blender_mcp.execute_code(
+            script, timeout=self.stage_timeout * len(stages)
+        )
+        if result.get("status") != "success":
+            raise Exception(f"Pipeline failed: {result.get('errors', [])}")
 
-print("FBX import successful")
-'''
-        elif extension == ".blend":
-            # For .blend files, append objects
-            import_code = f'''
-import bpy
+        stages = _parse_script_result(result.get("output", ""))
+        if stages is None:
+            raise Exception("Pipeline printed no result")
 
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
+        if "error" in stages.get("import", {}):
+            raise Exception(f"Import failed: {stages['import']['error']}")
 
-# Append all objects from .blend file
-with bpy.data.libraries.load(r"{mesh_path}") as (data_from, data_to):
-    data_to.objects = data_from.objects
+        return stages
 
-for obj in data_to.objects:
-    if obj is not None:
-        bpy.context.collection.objects.link(obj)
+    def _build_pipeline_script(self, stages: List[Tuple[str, str]]) -> str:
+        """
+        Fuse Blender stages into one script that prints one JSON dict
 
-print("BLEND import successful")
-'''
-        else:
+        Each stage body becomes its own function returning its `result`. A
+        stage that raises is recorded as {"error": ...} and the rest still
+        run, except that nothing runs after a failed import.
+        """
+        parts = ["import json\n"]
+        for name, body in stages:
+            parts.append(
+                f"\ndef _stage_{name}():\n"
+                f"{textwrap.indent(body.strip(), '    ')}\n"
+                f"    return result\n"
+            )
+
+        stage_refs = ", ".join(f'("{name}", _stage_{name})' for name, _ in stages)
+        parts.append(f'''
+pipeline = {{}}
+for name, stage in [{stage_refs}]:
+    try:
+        pipeline[name] = stage()
+    except Exception as e:
+        pipeline[name] = {{"error": str(e)}}
+        if name == "import":
+            break
+
+print("###RESULT###")
+print(json.dumps(pipeline))
+print("###END###")
+''')
+        return "".join(parts)
+
+    def _import_script(self, mesh_path: Path) -> str:
+        """Import mesh into Blender"""
+        extension = mesh_path.suffix.lower()
+
+        if extension not in _IMPORT_SCRIPT_TEMPLATES:
             raise ValueError(f"Unsupported file format: {extension}")
 
-        result = await self.blender_mcp.execute_code(import_code)
-        if result.get("status") != "success":
-            raise Exception(f"Import failed: {result.get('errors', [])}")
+        return _IMPORT_SCRIPT_TEMPLATES[extension].substitute(path=repr(str(mesh_path)))
 
-    async def _get_mesh_stats(self) -> Dict[str, Any]:
+    def _mesh_stats_script(self) -> str:
         """Get statistics about the current mesh"""
-        stats_code = '''
+        return '''
 import bpy
-import json
 
 obj = bpy.context.active_object
 if obj and obj.type == 'MESH':
     mesh = obj.data
-    mesh.calc_loop_triangles()
 
-    stats = {
+    result = {
         "vertices": len(mesh.vertices),
         "edges": len(mesh.edges),
         "faces": len(mesh.polygons),
-        "triangles": len(mesh.loop_triangles),
+        # An n-sided polygon triangulates to n - 2 triangles, so the count
+        # needs no calc_loop_triangles() pass over the whole mesh
+        "triangles": len(mesh.loops) - 2 * len(mesh.polygons),
         "has_uvs": len(mesh.uv_layers) > 0,
         "materials": len(obj.material_slots)
     }
-    print(json.dumps(stats))
 else:
-    print(json.dumps({"error": "No active mesh object"}))
+    result = {"error": "No active mesh object"}
 '''
-        result = await self.blender_mcp.execute_code(stats_code)
-        if result.get("status") == "success":
-            output = result.get("output", "{}")
-            # Parse last line of output as JSON
-            lines = output.strip().split('\n')
-            return json.loads(lines[-1])
-        return {}
-
-    async def _cleanup_topology(self, profile: GameAssetProfile) -> Dict[str, Any]:
-        """Clean up mesh topology (remove doubles, dissolve n-gons, etc.)"""
-        cleanup_code = f'''
-import bpy
-import json
-
-obj = bpy.context.active_object
-if obj and obj.type == 'MESH':
-    # Enter edit mode
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-
-    # Remove doubles
-    bpy.ops.mesh.remove_doubles(threshold=0.0001)
-
-    # Dissolve degenerate edges
-    bpy.ops.mesh.dissolve_degenerate(threshold=0.0001)
 
-    # Convert n-gons to triangles/quads if needed
-    {"bpy.ops.mesh.tris_convert_to_quads()" if profile.prefer_quads else ""}
-
-    # Recalculate normals
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-
-    # Exit edit mode
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    # Get updated stats
-    mesh = obj.data
-    mesh.calc_loop_triangles()
-
-    ngon_count = sum(1 for p in mesh.polygons if len(p.vertices) > 4)
-    tri_count = sum(1 for p in mesh.polygons if len(p.vertices) == 3)
-    quad_count = sum(1 for p in mesh.polygons if len(p.vertices) == 4)
-
-    quality_score = 1.0
-    if ngon_count > 0 and not {str(profile.allow_ngons).lower()}:
-        quality_score -= 0.3
-    if tri_count > quad_count and {str(profile.prefer_quads).lower()}:
-        quality_score -= 0.2
-
-    result = {{
-        "ngons": ngon_count,
-        "tris": tri_count,
-        "quads": quad_count,
-        "quality_score": max(0.0, quality_score)
-    }}
+    def _cleanup_script(self, profile: GameAssetProfile) -> str:
+        """Clean up mesh topology (remove doubles, dissolve n-gons, etc.)"""
+        return _render_cleanup_script(profile.prefer_quads, profile.allow_ngons)
 
-    print(json.dumps(result))
-else:
-    print(json.dumps({{"error": "No active mesh"}}))
-'''
-        result = await self.blender_mcp.execute_code(cleanup_code)
-        if result.get("status") == "success":
-            output = result.get("output", "{}")
-            lines = output.strip().split('\n')
-            return json.loads(lines[-1])
-        return {"quality_score": 0.0}
-
-    async def _unwrap_uvs(self, profile: GameAssetProfile) -> Dict[str, Any]:
+    def _unwrap_script(self, profile: GameAssetProfile) -> str:
         """Unwrap UVs using Smart UV Project"""
-        unwrap_code = f'''
-import bpy
-import json
-import math
-
-obj = bpy.context.active_object
-if obj and obj.type == 'MESH':
-    # Enter edit mode
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-
-    # Smart UV Project
-    bpy.ops.uv.smart_project(
-        angle_limit=math.radians(66.0),
-        island_margin=0.02,
-        area_weight=1.0
-    )
-
-    # Pack UV islands
-    bpy.ops.uv.pack_islands(margin=0.01)
-
-    # Exit edit mode
-    bpy.ops.object.mode_set(mode='OBJECT')
-
-    # Calculate UV coverage
-    mesh = obj.data
-    if mesh.uv_layers:
-        uv_layer = mesh.uv_layers.active.data
-
-        # Simple coverage estimation
-        # Count unique UV coordinates in 0-1 range
-        uv_coords = set()
-        for loop in mesh.loops:
-            uv = uv_layer[loop.index].uv
-            uv_coords.add((int(uv.x * 100), int(uv.y * 100)))
-
-        coverage = len(uv_coords) / 10000.0  # Normalize to 0-1
-
-        # Count islands (approximate)
-        islands = len(mesh.uv_layers)
-
-        quality_score = coverage
-        if coverage < {profile.min_uv_coverage}:
-            quality_score *= 0.7
-
-        result = {{
-            "coverage": coverage,
-            "islands": islands,
-            "quality_score": quality_score
-        }}
-    else:
-        result = {{
-            "coverage": 0.0,
-            "islands": 0,
-            "quality_score": 0.0,
-            "error": "No UV layer created"
-        }}
+        return _render_unwrap_script(profile.min_uv_coverage)
 
-    print(json.dumps(result))
-else:
-    print(json.dumps({{"error": "No active mesh"}}))
-'''
-        result = await self.blender_mcp.execute_code(unwrap_code)
-        if result.get("status") == "success":
-            output = result.get("output", "{}")
-            lines = output.strip().split('\n')
-            return json.loads(lines[-1])
-        return {"coverage": 0.0, "quality_score": 0.0}
-
-    async def _generate_pbr_materials(self, profile: GameAssetProfile) -> Dict[str, Any]:
+    def _materials_script(self, profile: GameAssetProfile) -> str:
         """Generate PBR materials for the mesh"""
-
-        # Create materials code
-        materials_code = '''
-import bpy
-import json
-
-obj = bpy.context.active_object
-if obj and obj.type == 'MESH':
-    materials_created = []
-
-'''
-        # Add each material from profile
-        for mat_key, mat_prof in profile.materials.items():
-            materials_code += f'''
-    # Create {mat_prof.name}
-    mat = bpy.data.materials.new(name="{mat_prof.name}")
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    if bsdf:
-        bsdf.inputs['Base Color'].default_value = {mat_prof.base_color}
-        bsdf.inputs['Metallic'].default_value = {mat_prof.metallic}
-        bsdf.inputs['Roughness'].default_value = {mat_prof.roughness}
-    materials_created.append("{mat_prof.name}")
-
-'''
-
-        materials_code += '''
-    # Assign first material to object if it has none
-    if len(obj.material_slots) == 0 and materials_created:
-        mat_name = materials_created[0]
-        mat = bpy.data.materials.get(mat_name)
-        if mat:
-            obj.data.materials.append(mat)
-
-    print(json.dumps({"materials": materials_created}))
-else:
-    print(json.dumps({"materials": [], "error": "No active mesh"}))
-'''
-
-        result = await self.blender_mcp.execute_code(materials_code)
-        if result.get("status") == "success":
-            output = result.get("output", "{}")
-            lines = output.strip().split('\n')
-            return json.loads(lines[-1])
-        return {"materials": []}
+        return _render_materials_script(tuple(
+            (mat.name, tuple(mat.base_color), mat.metallic, mat.roughness)
+            for mat in profile.materials.values()
+        ))
 
     async def _bake_normal_maps(self, profile: GameAssetProfile) -> Dict[str, Any]:
         """Bake normal maps (if high-poly source exists)"""
@@ -460,122 +872,140 @@ else:
         # This would be implemented if we have a high-detail source mesh
         return {"textures": [], "note": "Normal baking requires high-poly source"}
 
-    async def _generate_lods(self, profile: GameAssetProfile) -> Dict[str, Any]:
+    def _lod_script(self, profile: GameAssetProfile) -> str:
         """Generate LOD levels using Decimate modifier"""
+        return _render_lod_script(tuple(
+            lod.reduction_ratio for lod in profile.lod_levels[1:]
+        ))
 
-        lod_code = '''
-import bpy
-import json
-
-obj = bpy.context.active_object
-if obj and obj.type == 'MESH':
-    lod_stats = {}
-    lod_objects = []
+    async def _decimate_lods_in_background(
+        self,
+        profile: GameAssetProfile,
+        lod0_path: Path
+    ) -> List[Tuple[str, Path, int]]:
+        """
+        Decimate LOD1+ from the saved LOD0, one headless Blender per LOD
 
-    # LOD0 is the original object
-    obj.name = "LOD0"
-    mesh = obj.data
-    mesh.calc_loop_triangles()
-    lod_stats["LOD0"] = len(mesh.loop_triangles)
+        Each LOD is an independent decimation of LOD0, so they all run at
+        once. A failed LOD is reported and left out (validation then flags
+        the missing level).
 
-    # Create additional LODs
-'''
+        Returns:
+            (LOD name, .blend path, triangles) for every LOD that was written
+        """
+        lod_files = [
+            (f"LOD{i}", lod0_path.with_name(f"LOD{i}.blend"))
+            for i in range(1, len(profile.lod_levels))
+        ]
+
+        outcomes = await asyncio.gather(
+            *(
+                self._run_background(
+                    _BACKGROUND_DECIMATE_TEMPLATE.substitute(
+                        source_path=repr(str(lod0_path)),
+                        output_path=repr(str(path)),
+                        lod_name=repr(name),
+                        decimate=_decimate_snippet(
+                            "Decimate",
+                            lod.reduction_ratio,
+                            cluster=lod.reduction_ratio < _CLUSTER_DECIMATE_RATIO
+                        ).strip()
+                    )
+                )
+                for (name, path), lod in zip(lod_files, profile.lod_levels[1:])
+            ),
+            return_exceptions=True
+        )
 
-        for i, lod in enumerate(profile.lod_levels[1:], start=1):
-            lod_code += f'''
-    # Create LOD{i}
-    lod_obj = obj.copy()
-    lod_obj.data = obj.data.copy()
-    lod_obj.name = "LOD{i}"
-    bpy.context.collection.objects.link(lod_obj)
+        written = []
+        for (name, path), outcome in zip(lod_files, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"  ⚠ {name} decimation failed: {outcome}")
+            else:
+                written.append((name, path, outcome.get("triangles", 0)))
+        return written
 
-    # Add Decimate modifier
-    decimate = lod_obj.modifiers.new(name="Decimate_LOD{i}", type='DECIMATE')
-    decimate.ratio = {lod.reduction_ratio}
-    decimate.use_collapse_triangulate = True
+    async def _export_lods_in_background(
+        self,
+        asset_name: str,
+        profile: GameAssetProfile,
+        lod_files: List[Tuple[str, Path, int]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Export every LOD to its own FBX, one headless Blender per LOD
 
-    # Apply modifier
-    bpy.context.view_layer.objects.active = lod_obj
-    bpy.ops.object.modifier_apply(modifier="Decimate_LOD{i}")
+        FBX encoding is single-threaded inside Blender, so one file per LOD
+        spread over processes finishes in roughly the time of the largest
+        LOD. Used instead of the combined export when the profile's
+        export_settings set "split_lod_files".
 
-    # Get stats
-    lod_obj.data.calc_loop_triangles()
-    lod_stats["LOD{i}"] = len(lod_obj.data.loop_triangles)
-    lod_objects.append("LOD{i}")
+        Returns:
+            "lods" and "export" stage results, shaped like the in-session ones
+        """
+        options = _fbx_export_options(profile)
+        fbx_paths = [self.output_dir / f"{asset_name}_{name}.fbx" for name, _, _ in lod_files]
+
+        outcomes = await asyncio.gather(
+            *(
+                self._run_background(
+                    _BACKGROUND_EXPORT_TEMPLATE.substitute(
+                        options,
+                        source_path=repr(str(path)),
+                        lod_name=repr(name),
+                        output_path=repr(str(fbx_path))
+                    )
+                )
+                for (name, path, _), fbx_path in zip(lod_files, fbx_paths)
+            ),
+            return_exceptions=True
+        )
 
-'''
+        exported = []
+        for (name, _, _), outcome in zip(lod_files, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"  ⚠ {name} export failed: {outcome}")
+            else:
+                exported.append(outcome.get("fbx_path"))
 
-        lod_code += f'''
-    result = {{
-        "lod_count": {len(profile.lod_levels)},
-        "lod0_triangles": lod_stats.get("LOD0", 0),
-        "lod_stats": lod_stats,
-        "lod_objects": lod_objects
-    }}
+        lod_stats = {name: triangles for name, _, triangles in lod_files}
+        return {
+            "lods": {
+                "lod_count": len(lod_stats),
+                "lod0_triangles": lod_stats.get("LOD0", 0),
+                "lod_stats": lod_stats,
+                "lod_objects": [name for name in lod_stats if name != "LOD0"]
+            },
+            "export": {
+                "fbx_path": exported[0] if exported else None,
+                "lod_fbx_paths": exported,
+                "texture_dir": str(self.output_dir / f"{asset_name}_textures")
+            }
+        }
 
-    print(json.dumps(result))
-else:
-    print(json.dumps({{"lod_count": 0, "error": "No active mesh"}}))
-'''
+    async def _run_background(self, script: str) -> Dict[str, Any]:
+        """Run a script in a headless Blender once a core is free
 
-        result = await self.blender_mcp.execute_code(lod_code)
-        if result.get("status") == "success":
-            output = result.get("output", "{}")
-            lines = output.strip().split('\n')
-            return json.loads(lines[-1])
-        return {"lod_count": 0}
+        The process gets one stage timeout once it has a core; waiting for
+        the core does not count against it.
+        """
+        async with self._background_slots:
+            return await _run_background_blender(
+                self.blender_executable, script, self.stage_timeout
+            )
 
-    async def _export_game_asset(
+    def _export_script(
         self,
-        asset_name: str,
+        output_path: Path,
+        texture_dir: Path,
         profile: GameAssetProfile
-    ) -> Dict[str, str]:
+    ) -> str:
         """Export game asset as FBX with textures"""
 
-        output_path = self.output_dir / f"{asset_name}.fbx"
-        texture_dir = self.output_dir / f"{asset_name}_textures"
-
-        # Convert export settings to Blender API format
-        export_settings = profile.export_settings.copy()
-
-        export_code = f'''
-import bpy
-import json
-
-# Select all LOD objects
-bpy.ops.object.select_all(action='DESELECT')
-for obj in bpy.data.objects:
-    if obj.name.startswith("LOD"):
-        obj.select_set(True)
-
-# Export FBX
-output_path = r"{output_path}"
-bpy.ops.export_scene.fbx(
-    filepath=output_path,
-    use_selection=True,
-    object_types={{'MESH'}},
-    apply_scale_options='FBX_SCALE_ALL',
-    axis_forward='{export_settings.get("axis_forward", "-Z")}',
-    axis_up='{export_settings.get("axis_up", "Y")}',
-    bake_anim={str(export_settings.get("bake_anim", False)).lower()},
-    path_mode='{export_settings.get("path_mode", "COPY")}',
-    embed_textures={str(export_settings.get("embed_textures", False)).lower()}
-)
-
-result = {{
-    "fbx_path": output_path,
-    "texture_dir": r"{texture_dir}"
-}}
-
-print(json.dumps(result))
-'''
-
-        result = await self.blender_mcp.execute_code(export_code)
-        if result.get("status") == "success":
-            output = result.get("output", "{}")
-            lines = output.strip().split('\n')
-            return json.loads(lines[-1])
-        return {"fbx_path": str(output_path), "texture_dir": str(texture_dir)}
+        return _EXPORT_SCRIPT_TEMPLATE.substitute(
+            _fbx_export_options(profile),
+            output_path=repr(str(output_path)),
+            texture_dir=repr(str(texture_dir))
+        )
 
     async def _validate_game_asset(
         self,
@@ -651,6 +1081,7 @@ print(json.dumps(result))
             "textures": metadata.textures_baked,
             "export": {
                 "fbx_path": metadata.fbx_path,
+                "lod_fbx_paths": metadata.lod_fbx_paths,
                 "texture_dir": metadata.texture_dir
             },
             "quality": {
@@ -664,12 +1095,124 @@ print(json.dumps(result))
             }
         }
 
-        with open(output_path, 'w') as f:
-            json.dump(metadata_dict, f, indent=2)
+        output_path.write_bytes(orjson.dumps(metadata_dict, option=orjson.OPT_INDENT_2))
 
         print(f"[GameAssetAgent] Metadata saved: {output_path}")
 
 
+@lru_cache(maxsize=32)
+def _render_cleanup_script(prefer_quads: bool, allow_ngons: bool) -> str:
+    """Render the topology cleanup script for a profile's topology flags"""
+    return _CLEANUP_SCRIPT_TEMPLATE.substitute(
+        quads_op="bpy.ops.mesh.tris_convert_to_quads()" if prefer_quads else "",
+        allow_ngons=repr(allow_ngons),
+        prefer_quads=repr(prefer_quads)
+    )
+
+
+@lru_cache(maxsize=32)
+def _render_unwrap_script(min_uv_coverage: float) -> str:
+    """Render the UV unwrap script for a coverage threshold"""
+    return _UNWRAP_SCRIPT_TEMPLATE.substitute(min_uv_coverage=min_uv_coverage)
+
+
+@lru_cache(maxsize=32)
+def _render_materials_script(
+    materials: Tuple[Tuple[str, tuple, float, float], ...]
+) -> str:
+    """Render the PBR materials script for (name, base_color, metallic, roughness) specs"""
+    return _MATERIALS_SCRIPT_TEMPLATE.substitute(material_specs=repr(list(materials)))
+
+
+@lru_cache(maxsize=32)
+def _render_lod_script(reduction_ratios: Tuple[float, ...]) -> str:
+    """Render the LOD script; one decimated copy per ratio (LOD1 onwards)
+
+    Ratios are relative to LOD0, but each LOD is decimated from the one
+    before it, so it is given the step ratio between the two.
+    """
+    blocks = []
+    previous = 1.0
+    for i, ratio in enumerate(reduction_ratios, start=1):
+        step = min(1.0, ratio / previous) if previous > 0 else ratio
+        decimate = _decimate_snippet(f"Decimate_LOD{i}", step, cluster=ratio < _CLUSTER_DECIMATE_RATIO)
+        blocks.append(_LOD_BLOCK_TEMPLATE.substitute(
+            i=i, decimate=textwrap.indent(decimate.strip(), "    ")
+        ))
+        previous = ratio
+
+    return _LOD_SCRIPT_TEMPLATE.substitute(
+        lod_blocks="".join(blocks),
+        lod_count=len(reduction_ratios) + 1
+    )
+
+
+def _decimate_snippet(modifier_name: str, ratio: float, cluster: bool) -> str:
+    """Modifier setup reducing `lod_obj` to `ratio` of its triangles"""
+    template = _CLUSTER_DECIMATE_TEMPLATE if cluster else _COLLAPSE_DECIMATE_TEMPLATE
+    return template.substitute(modifier_name=repr(modifier_name), ratio=ratio)
+
+
+def _fbx_export_options(profile: GameAssetProfile) -> Dict[str, str]:
+    """Profile export settings as Python literals for the FBX export templates"""
+    export_settings = profile.export_settings
+    return {
+        "axis_forward": repr(export_settings.get("axis_forward", "-Z")),
+        "axis_up": repr(export_settings.get("axis_up", "Y")),
+        "bake_anim": repr(bool(export_settings.get("bake_anim", False))),
+        "path_mode": repr(export_settings.get("path_mode", "COPY")),
+        "embed_textures": repr(bool(export_settings.get("embed_textures", False))),
+    }
+
+
+async def _run_background_blender(
+    blender_executable: str,
+    script: str,
+    timeout: float
+) -> Dict[str, Any]:
+    """Run a script in a fresh headless Blender and parse its printed result
+
+    A Blender that outlives `timeout`, or whose caller is cancelled, is
+    killed and reaped before the error propagates, so it never keeps
+    running against files the caller is about to clean up.
+    """
+    process = await asyncio.create_subprocess_exec(
+        blender_executable, "--background", "--factory-startup",
+        "--python-exit-code", "1", "--python-expr", script,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise TimeoutError(f"Headless Blender did not finish within {timeout}s") from None
+        raise
+
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"Blender exited with {process.returncode}: "
+            f"{stderr.decode('utf-8', errors='replace').strip()[-500:]}"
+        )
+
+    return _parse_script_result(stdout.decode('utf-8', errors='replace')) or {}
+
+
+def _parse_script_result(output: str) -> Optional[Dict[str, Any]]:
+    """Parse the JSON a script printed between the result sentinels
+
+    Blender and the stage scripts may print anything around it (warnings,
+    "Blender quit"), so the output is never split into lines.
+    """
+    match = _RESULT_RE.search(output)
+    if match is None:
+        return None
+    return orjson.loads(match.group(1))
+
+
 # Convenience function
 async def process_battleship_mesh(
     mesh_path: Path,
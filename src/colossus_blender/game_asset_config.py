@@ -4,7 +4,9 @@ Defines quality settings, polygon budgets, and export formats for different game
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
 from enum import Enum
 
 
@@ -27,7 +29,7 @@ class ExportFormat(Enum):
     BLEND = "blend"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LODLevel:
     """Level of Detail configuration"""
     name: str
@@ -38,7 +40,7 @@ class LODLevel:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TextureSettings:
     """Texture resolution and format settings"""
     albedo_size: int = 4096
@@ -50,7 +52,7 @@ class TextureSettings:
     compression: bool = True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MaterialProfile:
     """PBR material configuration for naval vessels"""
     name: str
@@ -100,7 +102,7 @@ NAVAL_MATERIALS = {
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GameAssetProfile:
     """Complete asset profile for a specific game/platform"""
     name: str
@@ -403,18 +405,24 @@ UNREAL_ENGINE_PROFILE = GameAssetProfile(
 # PROFILE REGISTRY
 # ==============================================================================
 
-GAME_PROFILES: Dict[str, GameAssetProfile] = {
+# Read-only: get_profile() memoizes lookups, so the registry must not change
+GAME_PROFILES: Mapping[str, GameAssetProfile] = MappingProxyType({
     "war_thunder": WAR_THUNDER_PROFILE,
     "world_of_warships": WORLD_OF_WARSHIPS_PROFILE,
     "unity": UNITY_ASSET_STORE_PROFILE,
     "unreal": UNREAL_ENGINE_PROFILE,
     "asset_store": UNITY_ASSET_STORE_PROFILE,  # Alias
-}
+})
+
 
+# Profile names accept spaces and hyphens for underscores ("War Thunder")
+_NORMALIZE_TABLE = str.maketrans(" -", "__")
 
+
+@lru_cache(maxsize=32)
 def get_profile(profile_name: str) -> GameAssetProfile:
-    """Get a game asset profile by name"""
-    profile_name = profile_name.lower().replace(" ", "_").replace("-", "_")
+    """Get a game asset profile by name (profiles are shared and immutable)"""
+    profile_name = profile_name.lower().translate(_NORMALIZE_TABLE)
 
     if profile_name not in GAME_PROFILES:
         raise ValueError(
@@ -439,20 +447,19 @@ def create_custom_profile(
 ) -> GameAssetProfile:
     """Create a custom profile with simplified parameters"""
 
-    # Generate LOD levels with automatic reduction
-    lod_levels = []
-    for i in range(lod_count):
-        reduction = 0.5 ** i
-        lod_levels.append(
-            LODLevel(
-                name=f"LOD{i}",
-                max_triangles=int(lod0_triangles * reduction),
-                reduction_ratio=reduction,
-                distance_min=i * 100,
-                distance_max=(i + 1) * 250,
-                description=f"LOD level {i}"
-            )
+    # Generate LOD levels with automatic reduction (each LOD halves the last)
+    reductions = [0.5 ** i for i in range(lod_count)]
+    lod_levels = [
+        LODLevel(
+            name=f"LOD{i}",
+            max_triangles=int(lod0_triangles * reduction),
+            reduction_ratio=reduction,
+            distance_min=i * 100,
+            distance_max=(i + 1) * 250,
+            description=f"LOD level {i}"
         )
+        for i, reduction in enumerate(reductions)
+    ]
 
     return GameAssetProfile(
         name=name,
@@ -479,21 +486,25 @@ def validate_profile(profile: GameAssetProfile) -> List[str]:
     """Validate a game asset profile configuration"""
     issues = []
 
-    # Check LOD progression
-    if profile.lod_levels:
-        prev_tris = float('inf')
-        for lod in profile.lod_levels:
-            if lod.max_triangles > prev_tris:
-                issues.append(
-                    f"{lod.name} has more triangles ({lod.max_triangles}) "
-                    f"than previous LOD ({prev_tris})"
-                )
-            prev_tris = lod.max_triangles
-
-    # Check texture sizes are power of 2
-    for attr in ['albedo_size', 'normal_size', 'roughness_size', 'metallic_size', 'ao_size']:
-        size = getattr(profile.textures, attr)
-        if size & (size - 1) != 0:
+    # Check LOD progression (each LOD no heavier than the one before it)
+    lods = profile.lod_levels
+    for prev, lod in zip(lods, lods[1:]):
+        if lod.max_triangles > prev.max_triangles:
+            issues.append(
+                f"{lod.name} has more triangles ({lod.max_triangles}) "
+                f"than previous LOD ({prev.max_triangles})"
+            )
+
+    # Check texture sizes are power of 2 (exactly one bit set)
+    textures = profile.textures
+    for attr, size in (
+        ("albedo_size", textures.albedo_size),
+        ("normal_size", textures.normal_size),
+        ("roughness_size", textures.roughness_size),
+        ("metallic_size", textures.metallic_size),
+        ("ao_size", textures.ao_size),
+    ):
+        if size.bit_count() != 1:
             issues.append(f"Texture {attr} ({size}) is not a power of 2")
 
     # Check materials exist
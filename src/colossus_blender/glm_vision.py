@@ -4,14 +4,86 @@ Z.AI's state-of-the-art multimodal vision model for Blender scene evaluation
 """
 
 import os
+import re
 import json
 import base64
-from typing import Dict, Any, List, Optional
-import aiohttp
+import asyncio
+import binascii
+import hashlib
+import tempfile
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Union
+import orjson
 from dataclasses import dataclass
 
 from .vision_utils import extract_json_from_content
 
+if TYPE_CHECKING:
+    # aiohttp is imported where a session is first created, so importing this
+    # module (e.g. for GLMConfig or a CLI --help) doesn't pay its import cost.
+    import aiohttp
+
+
+# Fallback patterns for pulling per-criterion scores out of free-form text
+_SCORE_PATTERNS = {
+    key: re.compile(rf"{key}[:\s]+(\d+)")
+    for key in ("composition", "lighting", "materials", "camera", "goal_match")
+}
+
+_PNG_DATA_URI_PREFIX = b"data:image/png;base64,"
+_MAX_ERROR_BODY_BYTES = 2048
+
+# Pooled sessions shared by the convenience helpers, keyed by API base URL,
+# so repeated evaluations reuse TCP/TLS connections instead of reconnecting.
+# Sessions and their lock are bound to the loop that created them, so each
+# running loop gets its own pool; entries vanish with their loop.
+_SessionPool = Tuple[asyncio.Lock, Dict[str, "aiohttp.ClientSession"]]
+_SHARED_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _SessionPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_pool() -> _SessionPool:
+    """Get (or create) the session pool for the running event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _SHARED_POOLS.get(loop)
+    if pool is None:
+        pool = _SHARED_POOLS[loop] = (asyncio.Lock(), {})
+    return pool
+
+
+async def get_shared_session(api_base: str) -> "aiohttp.ClientSession":
+    """Get (or lazily create) the running loop's pooled session for an API base URL"""
+    import aiohttp
+
+    lock, sessions = _loop_pool()
+    async with lock:
+        session = sessions.get(api_base)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=10,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            sessions[api_base] = session
+        return session
+
+
+async def close_shared_sessions():
+    """Close the running loop's pooled sessions (call before the loop ends)"""
+    lock, sessions = _loop_pool()
+    async with lock:
+        to_close = list(sessions.values())
+        sessions.clear()
+    for session in to_close:
+        await session.close()
+
+
+class GLMAPIError(RuntimeError):
+    """Raised when the GLM API returns a non-200 response"""
+
 
 @dataclass
 class GLMConfig:
@@ -30,6 +102,8 @@ class GLMConfig:
     temperature: float = 0.7
     max_tokens: int = 2048
     thinking_enabled: bool = True  # GLM-4.5V deep reasoning mode
+    cache_enabled: bool = True  # Reuse results for identical screenshot + prompt
+    cache_dir: str = os.path.join(tempfile.gettempdir(), "colossus_glm_cache")
 
 
 class GLMVisionClient:
@@ -45,7 +119,99 @@ class GLMVisionClient:
     - Video understanding (temporal)
     """
 
-    def __init__(self, config: Optional[GLMConfig] = None):
+    # Static evaluation instructions. Kept at the start of the prompt so the
+    # long, unchanging part forms a stable prefix for provider prompt caching;
+    # only the goal/progress/feedback tail varies between iterations.
+    _STATIC_INSTRUCTIONS = """You are an expert 3D scene evaluator analyzing a Blender viewport screenshot.
+
+**Your Task**: Analyze this 3D scene screenshot and provide a comprehensive evaluation.
+
+**Evaluation Criteria** (rate each 0-10):
+
+1. **Composition** (0-10)
+   - Object placement and arrangement
+   - Scene balance and visual flow
+   - Use of space (not too empty, not too cluttered)
+   - Adherence to composition principles (rule of thirds, etc.)
+
+2. **Lighting** (0-10)
+   - Light quality and intensity
+   - Shadow quality and realism
+   - Overall visibility of important elements
+   - Mood and atmosphere
+   - Color temperature appropriateness
+
+3. **Materials** (0-10)
+   - Material realism and quality
+   - Color accuracy and appeal
+   - Texture detail and mapping
+   - Physically-based rendering quality
+   - Material variety and consistency
+
+4. **Camera** (0-10)
+   - Camera angle and framing
+   - Field of view appropriateness
+   - Focus and depth of field
+   - Viewpoint effectiveness for the scene
+
+5. **Goal Match** (0-10)
+   - How well does the scene match the original intent?
+   - Are all requested elements present?
+   - Does it capture the intended mood/style?
+   - Overall accuracy to description
+
+**Response Format** (JSON):
+
+```json
+{
+    "scores": {
+        "composition": <0-10>,
+        "lighting": <0-10>,
+        "materials": <0-10>,
+        "camera": <0-10>,
+        "goal_match": <0-10>
+    },
+    "overall_score": <0.0-1.0>,
+    "is_satisfactory": <true/false>,
+    "issues": [
+        "Specific issue 1",
+        "Specific issue 2"
+    ],
+    "specific_suggestions": [
+        "Concrete improvement 1 (e.g., 'Increase sun lamp energy to 7.0')",
+        "Concrete improvement 2 (e.g., 'Rotate camera 15 degrees clockwise')"
+    ],
+    "positive_aspects": [
+        "What's working well 1",
+        "What's working well 2"
+    ]
+}
+```
+
+**Important Guidelines**:
+
+1. **Be Specific**: Don't say "lighting is poor" - say "sun lamp energy too low at ~3.0, should be 6-8 for this scene"
+
+2. **Be Actionable**: Every suggestion must be a concrete Python operation (adjust parameter, move object, change color)
+
+3. **Overall Score Calculation**:
+   - overall_score = average of all 5 scores / 10
+   - Round to 2 decimal places
+
+4. **Satisfactory Threshold**:
+   - is_satisfactory = true if overall_score >= 0.75
+   - Consider iteration number (be more lenient on iteration 1)
+
+5. **Focus on Impact**: Prioritize suggestions that will have the biggest visual improvement
+
+6. **Realism**: Evaluate based on photorealism, stylistic consistency, and technical quality
+"""
+
+    def __init__(
+        self,
+        config: Optional[GLMConfig] = None,
+        session: Optional["aiohttp.ClientSession"] = None
+    ):
         if config is None:
             api_key = os.getenv("ZAI_API_KEY") or os.getenv("GLM_API_KEY")
             if not api_key:
@@ -55,19 +221,24 @@ class GLMVisionClient:
             config = GLMConfig(api_key=api_key)
 
         self.config = config
-        self.session = None
+        self.session = session
+        # Externally supplied sessions are owned (and closed) by the caller
+        self._owns_session = session is None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            import aiohttp
+            self.session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
+            self.session = None
 
     async def analyze_scene(
         self,
-        screenshot_base64: str,
+        screenshot_base64: Union[str, bytes],
         user_intent: str,
         iteration: int = 0,
         max_iterations: int = 3,
@@ -77,7 +248,8 @@ class GLMVisionClient:
         Analyze Blender scene screenshot using GLM-4.5V
 
         Args:
-            screenshot_base64: Base64-encoded PNG screenshot
+            screenshot_base64: Base64-encoded PNG screenshot (str, or the
+                ASCII bytes returned by base64.b64encode)
             user_intent: Original user goal/description
             iteration: Current iteration number
             max_iterations: Maximum iterations allowed
@@ -109,6 +281,20 @@ class GLMVisionClient:
             previous_feedback=previous_feedback
         )
 
+        # Build the data URL in one step; bytes input skips the caller-side
+        # decode. orjson cannot serialize bytes, so it must end up as str.
+        if isinstance(screenshot_base64, bytes):
+            image_url = (_PNG_DATA_URI_PREFIX + screenshot_base64).decode("ascii")
+        else:
+            image_url = f"data:image/png;base64,{screenshot_base64}"
+
+        cache_path = None
+        if self.config.cache_enabled:
+            cache_path = self._cache_path(image_url, prompt)
+            cached = self._cache_load(cache_path)
+            if cached is not None:
+                return cached
+
         # Call GLM-4.5V API
         response = await self._call_api(
             messages=[
@@ -122,7 +308,7 @@ class GLMVisionClient:
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/png;base64,{screenshot_base64}"
+                                "url": image_url
                             }
                         }
                     ]
@@ -149,12 +335,94 @@ class GLMVisionClient:
             if thinking_process:
                 analysis["thinking_process"] = thinking_process
 
+            if cache_path is not None:
+                self._cache_store(cache_path, analysis)
+
             return analysis
 
         except (json.JSONDecodeError, KeyError, IndexError, ValueError) as e:
             # Fallback: create structured response from text
             return self._parse_text_response(content, response)
 
+    def _cache_path(self, image_url: str, prompt: str) -> Path:
+        """Content-addressed cache location for a screenshot + prompt pair
+
+        The prompt hash also covers the model and generation settings, so
+        changing temperature, max_tokens or thinking mode misses the cache.
+        """
+        config = self.config
+        image_hash = hashlib.sha256(image_url.encode("ascii")).hexdigest()
+        prompt_hash = hashlib.sha256(
+            f"{config.model}\n{config.temperature!r}\n{config.max_tokens}\n"
+            f"{config.thinking_enabled}\n{prompt}".encode("utf-8")
+        ).hexdigest()
+        return Path(config.cache_dir) / f"{image_hash}_{prompt_hash}.json"
+
+    def _cache_load(self, cache_path: Path) -> Optional[Dict[str, Any]]:
+        """Read a cached analysis; a missing, unreadable or corrupt entry is a miss"""
+        try:
+            cached = orjson.loads(cache_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        return cached if isinstance(cached, dict) else None
+
+    def _cache_store(self, cache_path: Path, analysis: Dict[str, Any]):
+        """Write a parsed analysis to the cache (best effort)"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(orjson.dumps(analysis))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError):
+            pass
+
+    async def analyze_scene_bytes(
+        self,
+        png_bytes: bytes,
+        user_intent: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Analyze a scene from raw PNG bytes
+
+        Same as analyze_scene(), but for callers that hold the raw image
+        rather than a base64 string. Encodes once via binascii, skipping the
+        intermediate copy made by base64.b64encode.
+        """
+        screenshot_base64 = binascii.b2a_base64(png_bytes, newline=False)
+        return await self.analyze_scene(
+            screenshot_base64=screenshot_base64,
+            user_intent=user_intent,
+            **kwargs
+        )
+
+    async def analyze_scenes_batch(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 4
+    ) -> List[Any]:
+        """
+        Analyze several screenshots concurrently (e.g. multiple viewpoints)
+
+        Args:
+            items: One dict of analyze_scene() keyword arguments per image
+            concurrency: Maximum number of in-flight API calls
+
+        Returns:
+            Results in input order; a failed call yields its exception
+            instead of a result dict
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_scene(**kwargs)
+
+        return await asyncio.gather(
+            *(run_one(kwargs) for kwargs in items),
+            return_exceptions=True
+        )
+
     def _build_analysis_prompt(
         self,
         user_intent: str,
@@ -164,113 +432,33 @@ class GLMVisionClient:
     ) -> str:
         """Build comprehensive analysis prompt for GLM-4.5V"""
 
-        prompt = f"""You are an expert 3D scene evaluator analyzing a Blender viewport screenshot.
-
+        header = f"""
 **Original Goal**: {user_intent}
 
 **Current Progress**: Iteration {iteration + 1} of {max_iterations}
 """
 
+        previous = ""
         if previous_feedback:
-            prompt += f"""
+            previous = f"""
 **Previous Iteration Feedback**:
 - Score: {previous_feedback.get('overall_score', 0):.2%}
 - Issues: {', '.join(previous_feedback.get('issues', []))}
 - Changes Made: {', '.join(previous_feedback.get('specific_suggestions', []))}
 """
 
-        prompt += """
-**Your Task**: Analyze this 3D scene screenshot and provide a comprehensive evaluation.
-
-**Evaluation Criteria** (rate each 0-10):
-
-1. **Composition** (0-10)
-   - Object placement and arrangement
-   - Scene balance and visual flow
-   - Use of space (not too empty, not too cluttered)
-   - Adherence to composition principles (rule of thirds, etc.)
-
-2. **Lighting** (0-10)
-   - Light quality and intensity
-   - Shadow quality and realism
-   - Overall visibility of important elements
-   - Mood and atmosphere
-   - Color temperature appropriateness
-
-3. **Materials** (0-10)
-   - Material realism and quality
-   - Color accuracy and appeal
-   - Texture detail and mapping
-   - Physically-based rendering quality
-   - Material variety and consistency
-
-4. **Camera** (0-10)
-   - Camera angle and framing
-   - Field of view appropriateness
-   - Focus and depth of field
-   - Viewpoint effectiveness for the scene
-
-5. **Goal Match** (0-10)
-   - How well does the scene match the original intent?
-   - Are all requested elements present?
-   - Does it capture the intended mood/style?
-   - Overall accuracy to description
-
-**Response Format** (JSON):
-
-```json
-{
-    "scores": {
-        "composition": <0-10>,
-        "lighting": <0-10>,
-        "materials": <0-10>,
-        "camera": <0-10>,
-        "goal_match": <0-10>
-    },
-    "overall_score": <0.0-1.0>,
-    "is_satisfactory": <true/false>,
-    "issues": [
-        "Specific issue 1",
-        "Specific issue 2"
-    ],
-    "specific_suggestions": [
-        "Concrete improvement 1 (e.g., 'Increase sun lamp energy to 7.0')",
-        "Concrete improvement 2 (e.g., 'Rotate camera 15 degrees clockwise')"
-    ],
-    "positive_aspects": [
-        "What's working well 1",
-        "What's working well 2"
-    ]
-}
-```
-
-**Important Guidelines**:
-
-1. **Be Specific**: Don't say "lighting is poor" - say "sun lamp energy too low at ~3.0, should be 6-8 for this scene"
-
-2. **Be Actionable**: Every suggestion must be a concrete Python operation (adjust parameter, move object, change color)
-
-3. **Overall Score Calculation**:
-   - overall_score = average of all 5 scores / 10
-   - Round to 2 decimal places
-
-4. **Satisfactory Threshold**:
-   - is_satisfactory = true if overall_score >= 0.75
-   - Consider iteration number (be more lenient on iteration 1)
-
-5. **Focus on Impact**: Prioritize suggestions that will have the biggest visual improvement
-
-6. **Realism**: Evaluate based on photorealism, stylistic consistency, and technical quality
-
-Analyze the screenshot now and provide your evaluation in JSON format.
-"""
-
-        return prompt
+        return (
+            self._STATIC_INSTRUCTIONS
+            + header
+            + previous
+            + "\nAnalyze the screenshot now and provide your evaluation in JSON format.\n"
+        )
 
     async def _call_api(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Call GLM-4.5V API with vision support"""
 
         if not self.session:
+            import aiohttp
             self.session = aiohttp.ClientSession()
 
         headers = {
@@ -293,12 +481,18 @@ Analyze the screenshot now and provide your evaluation in JSON format.
 
         url = f"{self.config.api_base}/chat/completions"
 
-        async with self.session.post(url, headers=headers, json=payload) as resp:
+        # orjson serializes the large base64 image string much faster than
+        # the stdlib encoder aiohttp uses for json=
+        async with self.session.post(url, headers=headers, data=orjson.dumps(payload)) as resp:
             if resp.status != 200:
-                error_text = await resp.text()
-                raise Exception(f"GLM API error ({resp.status}): {error_text}")
+                # Error bodies can be large HTML pages from proxies; only the
+                # start is useful for the message.
+                error_bytes = await resp.content.read(_MAX_ERROR_BODY_BYTES)
+                raise GLMAPIError(
+                    f"GLM API error ({resp.status}): {error_bytes.decode('utf-8', 'replace')}"
+                )
 
-            return await resp.json()
+            return orjson.loads(await resp.read())
 
     def _parse_text_response(
         self,
@@ -317,14 +511,12 @@ Analyze the screenshot now and provide your evaluation in JSON format.
         }
 
         # Simple keyword-based extraction
-        for key in scores.keys():
-            if key in content.lower():
-                # Look for numbers near the keyword
-                import re
-                pattern = rf"{key}[:\s]+(\d+)"
-                match = re.search(pattern, content.lower())
-                if match:
-                    scores[key] = min(10, max(0, int(match.group(1))))
+        content_lower = content.lower()
+        for key, pattern in _SCORE_PATTERNS.items():
+            # Look for numbers near the keyword
+            match = pattern.search(content_lower)
+            if match:
+                scores[key] = min(10, max(0, int(match.group(1))))
 
         overall_score = sum(scores.values()) / (len(scores) * 10)
 
@@ -351,6 +543,9 @@ async def evaluate_screenshot_with_glm(
     """
     Quick helper to evaluate a screenshot
 
+    Reuses the running loop's pooled session; whoever owns the loop should
+    await close_shared_sessions() before it ends.
+
     Args:
         screenshot_base64: Base64-encoded screenshot
         user_intent: Original scene description
@@ -366,7 +561,10 @@ async def evaluate_screenshot_with_glm(
     else:
         config = None
 
-    async with GLMVisionClient(config=config) as client:
+    api_base = config.api_base if config else GLMConfig.api_base
+    session = await get_shared_session(api_base)
+
+    async with GLMVisionClient(config=config, session=session) as client:
         return await client.analyze_scene(
             screenshot_base64=screenshot_base64,
             user_intent=user_intent,
@@ -410,6 +608,12 @@ async def test_glm_vision():
             return False
 
 
+async def _main():
+    try:
+        await test_glm_vision()
+    finally:
+        await close_shared_sessions()
+
+
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(test_glm_vision())
+    asyncio.run(_main())
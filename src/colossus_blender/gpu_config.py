@@ -3,8 +3,10 @@ GPU Configuration Module for Blender Rendering
 Supports RTX 3090 and RTX 5090 with optimized settings
 """
 
-from dataclasses import dataclass
-from typing import Literal
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+from string import Template
+from typing import Any, Dict, Literal, Tuple
 from enum import Enum
 
 
@@ -15,7 +17,7 @@ class GPUModel(Enum):
     AUTO = "auto"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GPUSpecs:
     """GPU hardware specifications"""
     model: str
@@ -50,9 +52,9 @@ GPU_SPECS = {
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RenderSettings:
-    """Blender Cycles render settings"""
+    """Blender Cycles render settings (immutable; profile instances are shared)"""
     # Device
     device: Literal["GPU", "CPU"] = "GPU"
     compute_device_type: Literal["CUDA", "OPTIX", "HIP", "METAL"] = "CUDA"
@@ -87,6 +89,138 @@ class RenderSettings:
     resolution_percentage: int = 100
 
 
+# Settings shared by every quality level on a GPU, applied on top of the
+# RenderSettings defaults (256px tiles, 20GB VRAM limit: 4GB headroom on a 3090)
+_GPU_OVERRIDES: Dict[GPUModel, Dict[str, Any]] = {
+    GPUModel.RTX_3090: {},
+    GPUModel.RTX_5090: {
+        "tile_size": 512,
+        "tile_x": 512,
+        "tile_y": 512,
+        "gpu_memory_limit_mb": 28672,  # Leave 3.5GB headroom
+    },
+}
+
+# Per-quality overrides; "production" on the 3090 is exactly the defaults
+_QUALITY_OVERRIDES: Dict[Tuple[GPUModel, str], Dict[str, Any]] = {
+    (GPUModel.RTX_3090, "preview"): {
+        "samples": 64,
+        "adaptive_threshold": 0.02,
+        "max_subdivisions": 1,
+        "simplify_subdivision": 1,
+        "volume_bounces": 1,
+        "subsurface_samples": 1,
+        "resolution_percentage": 50,
+    },
+    (GPUModel.RTX_3090, "production"): {},
+    (GPUModel.RTX_3090, "final"): {
+        "samples": 256,
+        "adaptive_threshold": 0.005,
+        "max_subdivisions": 3,
+        "use_simplify": False,
+        "simplify_subdivision": 3,
+        "volume_bounces": 4,
+        "subsurface_samples": 3,
+    },
+    # RTX 5090: more aggressive
+    (GPUModel.RTX_5090, "preview"): {
+        "resolution_percentage": 75,
+    },
+    (GPUModel.RTX_5090, "production"): {
+        "samples": 256,
+        "adaptive_threshold": 0.005,
+        "max_subdivisions": 4,
+        "use_simplify": False,
+        "simplify_subdivision": 3,
+        "volume_bounces": 4,
+        "subsurface_samples": 3,
+    },
+    (GPUModel.RTX_5090, "final"): {
+        "samples": 512,
+        "adaptive_threshold": 0.001,
+        "max_subdivisions": 6,
+        "use_simplify": False,
+        "simplify_subdivision": 4,
+        "volume_bounces": 8,
+        "subsurface_samples": 4,
+    },
+}
+
+# Finished profiles, built once at import and shared (RenderSettings is frozen)
+_PROFILES: Dict[Tuple[GPUModel, str], RenderSettings] = {
+    (gpu, quality): replace(RenderSettings(), **_GPU_OVERRIDES[gpu], **overrides)
+    for (gpu, quality), overrides in _QUALITY_OVERRIDES.items()
+}
+
+
+# Script applied by GPUConfigurator.generate_blender_code. Placeholders are
+# RenderSettings field names plus gpu_value, model_name and quality.
+_BLENDER_CODE_TEMPLATE = Template('''
+import bpy
+
+def configure_gpu_$gpu_value():
+    """Configure Blender for $model_name ($quality quality)"""
+
+    # Enable GPU compute
+    prefs = bpy.context.preferences.addons['cycles'].preferences
+    prefs.compute_device_type = '$compute_device_type'
+
+    # Enable all GPU devices
+    prefs.get_devices()
+    for device in prefs.devices:
+        if device.type == '$compute_device_type':
+            device.use = True
+            print(f"Enabled device: {device.name}")
+
+    # Scene settings
+    scene = bpy.context.scene
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = '$device'
+
+    # Sampling
+    scene.cycles.samples = $samples
+    scene.cycles.use_adaptive_sampling = $adaptive_sampling
+    scene.cycles.adaptive_threshold = $adaptive_threshold
+    scene.cycles.use_denoising = $denoising
+
+    # Tile settings
+    scene.cycles.tile_size = $tile_size
+    scene.render.tile_x = $tile_x
+    scene.render.tile_y = $tile_y
+
+    # Subdivision
+    scene.cycles.max_subdivisions = $max_subdivisions
+
+    # Simplification
+    scene.render.use_simplify = $use_simplify
+    scene.render.simplify_subdivision = $simplify_subdivision
+
+    # Volumetrics & SSS
+    scene.cycles.volume_bounces = $volume_bounces
+    scene.cycles.subsurface_samples = $subsurface_samples
+
+    # Resolution
+    scene.render.resolution_x = $resolution_x
+    scene.render.resolution_y = $resolution_y
+    scene.render.resolution_percentage = $resolution_percentage
+
+    print(f"GPU configured: $model_name - $quality quality")
+    print(f"Samples: $samples, Tile: ${tile_size}x$tile_size")
+
+    return {
+        "status": "success",
+        "gpu_model": "$model_name",
+        "quality": "$quality",
+        "samples": $samples,
+        "tile_size": $tile_size,
+        "vram_limit_mb": $gpu_memory_limit_mb
+    }
+
+# Execute configuration
+result = configure_gpu_$gpu_value()
+''')
+
+
 class GPUConfigurator:
     """Configure Blender for optimal GPU rendering"""
 
@@ -107,142 +241,10 @@ class GPUConfigurator:
                 - "production": Balanced quality/speed
                 - "final": Maximum quality
         """
-        if self.gpu_model == GPUModel.RTX_3090:
-            return self._get_3090_settings(quality)
-        elif self.gpu_model == GPUModel.RTX_5090:
-            return self._get_5090_settings(quality)
-        else:
+        profile = _PROFILES.get((self.gpu_model, quality)) or _PROFILES.get((self.gpu_model, "production"))
+        if profile is None:
             return self._get_fallback_settings(quality)
-
-    def _get_3090_settings(self, quality: str) -> RenderSettings:
-        """RTX 3090 optimized settings"""
-
-        quality_profiles = {
-            "preview": RenderSettings(
-                device="GPU",
-                compute_device_type="CUDA",
-                samples=64,
-                adaptive_sampling=True,
-                adaptive_threshold=0.02,
-                denoising=True,
-                tile_size=256,
-                tile_x=256,
-                tile_y=256,
-                use_gpu_memory_limit=True,
-                gpu_memory_limit_mb=20480,  # Leave 4GB headroom
-                max_subdivisions=1,
-                use_simplify=True,
-                simplify_subdivision=1,
-                volume_bounces=1,
-                subsurface_samples=1,
-                resolution_percentage=50
-            ),
-            "production": RenderSettings(
-                device="GPU",
-                compute_device_type="CUDA",
-                samples=128,
-                adaptive_sampling=True,
-                adaptive_threshold=0.01,
-                denoising=True,
-                tile_size=256,
-                tile_x=256,
-                tile_y=256,
-                use_gpu_memory_limit=True,
-                gpu_memory_limit_mb=20480,
-                max_subdivisions=2,
-                use_simplify=True,
-                simplify_subdivision=2,
-                volume_bounces=2,
-                subsurface_samples=2,
-                resolution_percentage=100
-            ),
-            "final": RenderSettings(
-                device="GPU",
-                compute_device_type="CUDA",
-                samples=256,
-                adaptive_sampling=True,
-                adaptive_threshold=0.005,
-                denoising=True,
-                tile_size=256,
-                tile_x=256,
-                tile_y=256,
-                use_gpu_memory_limit=True,
-                gpu_memory_limit_mb=20480,
-                max_subdivisions=3,
-                use_simplify=False,
-                simplify_subdivision=3,
-                volume_bounces=4,
-                subsurface_samples=3,
-                resolution_percentage=100
-            )
-        }
-
-        return quality_profiles.get(quality, quality_profiles["production"])
-
-    def _get_5090_settings(self, quality: str) -> RenderSettings:
-        """RTX 5090 optimized settings (more aggressive)"""
-
-        quality_profiles = {
-            "preview": RenderSettings(
-                device="GPU",
-                compute_device_type="CUDA",
-                samples=128,
-                adaptive_sampling=True,
-                adaptive_threshold=0.01,
-                denoising=True,
-                tile_size=512,
-                tile_x=512,
-                tile_y=512,
-                use_gpu_memory_limit=True,
-                gpu_memory_limit_mb=28672,  # Leave 3.5GB headroom
-                max_subdivisions=2,
-                use_simplify=True,
-                simplify_subdivision=2,
-                volume_bounces=2,
-                subsurface_samples=2,
-                resolution_percentage=75
-            ),
-            "production": RenderSettings(
-                device="GPU",
-                compute_device_type="CUDA",
-                samples=256,
-                adaptive_sampling=True,
-                adaptive_threshold=0.005,
-                denoising=True,
-                tile_size=512,
-                tile_x=512,
-                tile_y=512,
-                use_gpu_memory_limit=True,
-                gpu_memory_limit_mb=28672,
-                max_subdivisions=4,
-                use_simplify=False,
-                simplify_subdivision=3,
-                volume_bounces=4,
-                subsurface_samples=3,
-                resolution_percentage=100
-            ),
-            "final": RenderSettings(
-                device="GPU",
-                compute_device_type="CUDA",
-                samples=512,
-                adaptive_sampling=True,
-                adaptive_threshold=0.001,
-                denoising=True,
-                tile_size=512,
-                tile_x=512,
-                tile_y=512,
-                use_gpu_memory_limit=True,
-                gpu_memory_limit_mb=28672,
-                max_subdivisions=6,
-                use_simplify=False,
-                simplify_subdivision=4,
-                volume_bounces=8,
-                subsurface_samples=4,
-                resolution_percentage=100
-            )
-        }
-
-        return quality_profiles.get(quality, quality_profiles["production"])
+        return profile
 
     def _get_fallback_settings(self, quality: str) -> RenderSettings:
         """Conservative fallback settings"""
@@ -263,76 +265,26 @@ class GPUConfigurator:
         """
         Generate Python code to apply settings in Blender
 
+        The script only depends on (gpu_model, quality), so it is rendered
+        once per pair and memoized.
+
         Returns:
             Executable Python code for Blender
         """
-        settings = self.get_optimal_settings(quality)
-
-        code = f'''
-import bpy
-
-def configure_gpu_{self.gpu_model.value}():
-    """Configure Blender for {self.specs.model} ({quality} quality)"""
-
-    # Enable GPU compute
-    prefs = bpy.context.preferences.addons['cycles'].preferences
-    prefs.compute_device_type = '{settings.compute_device_type}'
-
-    # Enable all GPU devices
-    prefs.get_devices()
-    for device in prefs.devices:
-        if device.type == '{settings.compute_device_type}':
-            device.use = True
-            print(f"Enabled device: {{device.name}}")
-
-    # Scene settings
-    scene = bpy.context.scene
-    scene.render.engine = 'CYCLES'
-    scene.cycles.device = '{settings.device}'
-
-    # Sampling
-    scene.cycles.samples = {settings.samples}
-    scene.cycles.use_adaptive_sampling = {settings.adaptive_sampling}
-    scene.cycles.adaptive_threshold = {settings.adaptive_threshold}
-    scene.cycles.use_denoising = {settings.denoising}
-
-    # Tile settings
-    scene.cycles.tile_size = {settings.tile_size}
-    scene.render.tile_x = {settings.tile_x}
-    scene.render.tile_y = {settings.tile_y}
-
-    # Subdivision
-    scene.cycles.max_subdivisions = {settings.max_subdivisions}
-
-    # Simplification
-    scene.render.use_simplify = {settings.use_simplify}
-    scene.render.simplify_subdivision = {settings.simplify_subdivision}
-
-    # Volumetrics & SSS
-    scene.cycles.volume_bounces = {settings.volume_bounces}
-    scene.cycles.subsurface_samples = {settings.subsurface_samples}
-
-    # Resolution
-    scene.render.resolution_x = {settings.resolution_x}
-    scene.render.resolution_y = {settings.resolution_y}
-    scene.render.resolution_percentage = {settings.resolution_percentage}
-
-    print(f"GPU configured: {self.specs.model} - {quality} quality")
-    print(f"Samples: {settings.samples}, Tile: {settings.tile_size}x{settings.tile_size}")
-
-    return {{
-        "status": "success",
-        "gpu_model": "{self.specs.model}",
-        "quality": "{quality}",
-        "samples": {settings.samples},
-        "tile_size": {settings.tile_size},
-        "vram_limit_mb": {settings.gpu_memory_limit_mb}
-    }}
-
-# Execute configuration
-result = configure_gpu_{self.gpu_model.value}()
-'''
-        return code
+        return _render_blender_code(self.gpu_model, quality)
+
+
+@lru_cache(maxsize=8)
+def _render_blender_code(gpu_model: GPUModel, quality: str) -> str:
+    """Render the Blender GPU configuration script for a GPU/quality pair"""
+    configurator = GPUConfigurator(gpu_model)
+    params = asdict(configurator.get_optimal_settings(quality))
+    params.update(
+        gpu_value=gpu_model.value,
+        model_name=configurator.specs.model,
+        quality=quality
+    )
+    return _BLENDER_CODE_TEMPLATE.substitute(params)
 
 
 def generate_gpu_benchmark_code() -> str:
@@ -394,23 +346,31 @@ def get_gpu_config(gpu_model: str = "3090") -> GPUConfigurator:
     return GPUConfigurator(model_map.get(gpu_model, GPUModel.RTX_3090))
 
 
-def compare_gpus():
-    """Compare 3090 vs 5090 specifications"""
+def _build_comparison_lines() -> Tuple[str, ...]:
+    """Format the 3090 vs 5090 comparison (the specs are static)"""
     specs_3090 = GPU_SPECS[GPUModel.RTX_3090]
     specs_5090 = GPU_SPECS[GPUModel.RTX_5090]
 
-    print("=== GPU Comparison ===")
-    print(f"\nRTX 3090:")
-    print(f"  VRAM: {specs_3090.vram_gb}GB")
-    print(f"  CUDA Cores: {specs_3090.cuda_cores}")
-    print(f"  Max Tile: {specs_3090.max_tile_size}")
-    print(f"  Recommended Samples: {specs_3090.recommended_samples}")
-
-    print(f"\nRTX 5090:")
-    print(f"  VRAM: {specs_5090.vram_gb}GB (+{specs_5090.vram_gb - specs_3090.vram_gb}GB)")
-    print(f"  CUDA Cores: {specs_5090.cuda_cores} ({specs_5090.cuda_cores / specs_3090.cuda_cores:.1f}x)")
-    print(f"  Max Tile: {specs_5090.max_tile_size} ({specs_5090.max_tile_size / specs_3090.max_tile_size:.1f}x)")
-    print(f"  Recommended Samples: {specs_5090.recommended_samples} ({specs_5090.recommended_samples / specs_3090.recommended_samples:.1f}x)")
-
-    print(f"\nPerformance Improvement: ~2.0x faster rendering")
-    print(f"Memory Improvement: {((specs_5090.vram_gb - specs_3090.vram_gb) / specs_3090.vram_gb * 100):.0f}% more VRAM")
+    return (
+        "=== GPU Comparison ===",
+        "\nRTX 3090:",
+        f"  VRAM: {specs_3090.vram_gb}GB",
+        f"  CUDA Cores: {specs_3090.cuda_cores}",
+        f"  Max Tile: {specs_3090.max_tile_size}",
+        f"  Recommended Samples: {specs_3090.recommended_samples}",
+        "\nRTX 5090:",
+        f"  VRAM: {specs_5090.vram_gb}GB (+{specs_5090.vram_gb - specs_3090.vram_gb}GB)",
+        f"  CUDA Cores: {specs_5090.cuda_cores} ({specs_5090.cuda_cores / specs_3090.cuda_cores:.1f}x)",
+        f"  Max Tile: {specs_5090.max_tile_size} ({specs_5090.max_tile_size / specs_3090.max_tile_size:.1f}x)",
+        f"  Recommended Samples: {specs_5090.recommended_samples} ({specs_5090.recommended_samples / specs_3090.recommended_samples:.1f}x)",
+        "\nPerformance Improvement: ~2.0x faster rendering",
+        f"Memory Improvement: {((specs_5090.vram_gb - specs_3090.vram_gb) / specs_3090.vram_gb * 100):.0f}% more VRAM",
+    )
+
+
+_COMPARISON_LINES = _build_comparison_lines()
+
+
+def compare_gpus():
+    """Compare 3090 vs 5090 specifications"""
+    print("\n".join(_COMPARISON_LINES))
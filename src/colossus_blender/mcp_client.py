@@ -4,49 +4,84 @@ Handles communication with Blender via Model Context Protocol (MCP)
 Supports both direct socket communication and MCP tool calling
 """
 
-import json
-import socket
+import struct
 import asyncio
 import base64
+from string import Template
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
+import orjson
+
 
 class ConnectionMode(Enum):
     """MCP connection modes"""
     SOCKET = "socket"  # Direct TCP socket to Blender addon
     MCP_TOOLS = "mcp_tools"  # Via Claude/LLM MCP tools
+    BACKGROUND = "background"  # Long-lived headless Blender over stdin/stdout
+
 
+# Runs inside the headless Blender: one JSON request per stdin line, one
+# marked JSON response per stdout line (Blender's own logging is skipped)
+_BACKGROUND_RPC_LOOP = """
+import sys, io, json, contextlib, traceback
+
+for line in sys.stdin:
+    request = json.loads(line)
+    buffer = io.StringIO()
+    namespace = {"__name__": "__main__"}
+    try:
+        with contextlib.redirect_stdout(buffer):
+            exec(request["code"], namespace)
+        response = {"status": "success", "output": buffer.getvalue(), "errors": [],
+                    "result": namespace.get("result")}
+    except Exception:
+        response = {"status": "error", "output": buffer.getvalue(),
+                    "errors": [traceback.format_exc()], "result": None}
+    sys.stdout.write("###RPC###" + json.dumps(response, default=str) + "\\n")
+    sys.stdout.flush()
+"""
+_RPC_MARKER = b"###RPC###"
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class BlenderConfig:
     """Blender connection configuration"""
     host: str = "localhost"
     port: int = 9876
     timeout: float = 30.0
     connection_mode: ConnectionMode = ConnectionMode.SOCKET
+    blender_executable: str = "blender"  # For BACKGROUND mode
 
 
 class BlenderMCPClient:
     """
     Client for communicating with Blender via MCP
 
-    Supports two modes:
+    Supports three modes:
     1. Direct socket connection to Blender addon (addon.py)
     2. MCP tool calling through Claude/LLM (when integrated with Claude Desktop)
+    3. A headless Blender started once and fed scripts over its stdin, so a
+       batch of scripts pays Blender's startup cost only once
     """
 
     def __init__(self, config: Optional[BlenderConfig] = None, mcp_tool_caller=None):
         self.config = config or BlenderConfig()
         self.mcp_tool_caller = mcp_tool_caller
-        self.socket = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
         self._connected = False
+        self._process = None
+        # One request in flight at a time; replies are matched by order
+        self._request_lock = asyncio.Lock()
 
     async def connect(self) -> bool:
         """Establish connection to Blender"""
         if self.config.connection_mode == ConnectionMode.SOCKET:
             return await self._connect_socket()
+        elif self.config.connection_mode == ConnectionMode.BACKGROUND:
+            return await self._connect_background()
         else:
             # MCP tools don't require explicit connection
             return True
@@ -54,12 +89,9 @@ class BlenderMCPClient:
     async def _connect_socket(self) -> bool:
         """Connect via TCP socket"""
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(self.config.timeout)
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.socket.connect,
-                (self.config.host, self.config.port)
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.config.host, self.config.port),
+                self.config.timeout
             )
             self._connected = True
             print(f"[MCP Client] Connected to Blender at {self.config.host}:{self.config.port}")
@@ -69,18 +101,53 @@ class BlenderMCPClient:
             self._connected = False
             return False
 
+    async def _connect_background(self) -> bool:
+        """Start the long-lived headless Blender"""
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                self.config.blender_executable,
+                "--background", "--factory-startup",
+                "--python-expr", _BACKGROUND_RPC_LOOP,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                limit=64 * 1024 * 1024  # Responses carry whole script outputs on one line
+            )
+            print(f"[MCP Client] Started headless Blender (pid {self._process.pid})")
+            return True
+        except Exception as e:
+            print(f"[MCP Client] Could not start Blender: {e}")
+            self._process = None
+            return False
+
+    def is_connected(self) -> bool:
+        """Whether the client can currently talk to Blender"""
+        if self.config.connection_mode == ConnectionMode.SOCKET:
+            return self._connected
+        if self.config.connection_mode == ConnectionMode.BACKGROUND:
+            return self._process is not None and self._process.returncode is None
+        return True
+
     async def disconnect(self):
         """Close connection"""
-        if self.socket:
-            self.socket.close()
+        if self._writer:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._reader = self._writer = None
             self._connected = False
+        if self._process:
+            # EOF on stdin ends the RPC loop, and with it Blender
+            self._process.stdin.close()
+            await self._process.wait()
+            self._process = None
 
-    async def execute_code(self, code: str) -> Dict[str, Any]:
+    async def execute_code(self, code: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Execute Python code in Blender
 
         Args:
             code: Python code to execute
+            timeout: Seconds to wait for the reply in socket and background
+                modes (defaults to BlenderConfig.timeout)
 
         Returns:
             {
@@ -91,58 +158,159 @@ class BlenderMCPClient:
             }
         """
         if self.config.connection_mode == ConnectionMode.SOCKET:
-            return await self._execute_code_socket(code)
+            return await self._execute_code_socket(code, timeout)
+        elif self.config.connection_mode == ConnectionMode.BACKGROUND:
+            return await self._execute_code_background(code, timeout)
         else:
             return await self._execute_code_mcp_tools(code)
 
-    async def _execute_code_socket(self, code: str) -> Dict[str, Any]:
+    async def execute_batch(self, codes: List[str]) -> List[Dict[str, Any]]:
+        """
+        Execute several Python snippets in Blender, in order, in one round-trip
+
+        A failing snippet is reported in its own entry and does not stop the
+        ones after it. Over MCP tools, where there is no batch call, the
+        snippets are sent one by one.
+
+        Args:
+            codes: Python code snippets to execute
+
+        Returns:
+            One execute_code-style result dict per snippet
+        """
+        if self.config.connection_mode == ConnectionMode.SOCKET:
+            return await self._execute_batch_socket(codes)
+        elif self.config.connection_mode == ConnectionMode.BACKGROUND:
+            return await self._execute_batch_background(codes)
+        else:
+            return [await self._execute_code_mcp_tools(code) for code in codes]
+
+    async def _execute_code_socket(self, code: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """Execute code via direct socket connection"""
+        try:
+            response = await self._socket_request(_execute_code_frame(code), timeout)
+            return _execute_code_response(response)
+        except Exception as e:
+            return {
+                "status": "error",
+                "output": "",
+                "errors": [str(e)],
+                "result": None
+            }
+
+    async def _execute_batch_socket(self, codes: List[str]) -> List[Dict[str, Any]]:
+        """Execute a batch of snippets via one execute_batch socket command"""
+        try:
+            response = await self._socket_request(_frame({
+                "type": "execute_batch",
+                "params": {"codes": codes}
+            }))
+        except Exception as e:
+            response = {"status": "error", "message": str(e)}
+
+        if response.get("status") != "success":
+            return [_execute_code_response(response) for _ in codes]
+        return [
+            _execute_code_response({"status": "success", "result": entry})
+            for entry in response.get("result", [])
+        ]
+
+    async def _socket_request(self, frame: bytes, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send one framed command to the addon and return its parsed reply"""
         if not self._connected:
             await self.connect()
 
-        try:
-            # Prepare message
-            message = {
-                "command": "execute",
-                "code": code
-            }
-            message_json = json.dumps(message) + "\n"
+        timeout = self.config.timeout if timeout is None else timeout
 
+        async with self._request_lock:
             # Send
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.socket.sendall,
-                message_json.encode('utf-8')
-            )
+            self._writer.write(frame)
+            await self._writer.drain()
 
             # Receive response
-            response_data = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self._recv_until_newline
-            )
+            try:
+                return await asyncio.wait_for(self._recv_reply(), timeout)
+            except asyncio.TimeoutError:
+                # A late reply would be read as the next call's, so drop
+                # the connection; the next call reconnects
+                await self.disconnect()
+                raise TimeoutError(f"No reply from Blender within {timeout}s")
+            except (asyncio.IncompleteReadError, asyncio.CancelledError):
+                # Same for a cancelled call, whose reply is still coming
+                await self.disconnect()
+                raise
+
+    async def _recv_reply(self) -> Dict[str, Any]:
+        """
+        Receive one reply: 4-byte big-endian length, then the JSON body, then
+        as many raw bytes as the body's "binary_length" announces (if any)
+        """
+        header = await self._reader.readexactly(4)
+        response = orjson.loads(await self._reader.readexactly(struct.unpack('>I', header)[0]))
+
+        binary_length = response.pop("binary_length", 0)
+        if binary_length:
+            response["binary"] = await self._reader.readexactly(binary_length)
+        return response
 
-            response = json.loads(response_data)
-            return response
+    async def _execute_code_background(self, code: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Execute code in the long-lived headless Blender"""
+        return (await self._execute_batch_background([code], timeout))[0]
+
+    async def _execute_batch_background(
+        self,
+        codes: List[str],
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Pipe every snippet to the headless Blender, then read the replies"""
+        if not self.is_connected():
+            await self.connect()
+
+        timeout = self.config.timeout if timeout is None else timeout
+
+        try:
+            async with self._request_lock:
+                try:
+                    return await asyncio.wait_for(self._background_round_trip(codes), timeout)
+                except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                    # Unread replies would be taken as the next call's, so
+                    # drop this Blender; the next call starts a fresh one
+                    await self._kill_background()
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise TimeoutError(f"No reply from Blender within {timeout}s") from None
+                    raise
 
         except Exception as e:
-            return {
+            return [{
                 "status": "error",
                 "output": "",
                 "errors": [str(e)],
                 "result": None
-            }
-
-    def _recv_until_newline(self, buffer_size: int = 4096) -> str:
-        """Receive data until newline"""
-        data = b""
-        while True:
-            chunk = self.socket.recv(buffer_size)
-            if not chunk:
-                break
-            data += chunk
-            if b"\n" in data:
-                break
-        return data.decode('utf-8')
+            } for _ in codes]
+
+    async def _background_round_trip(self, codes: List[str]) -> List[Dict[str, Any]]:
+        """Write the snippets to Blender's stdin and read one reply per snippet"""
+        self._process.stdin.write(b"".join(
+            orjson.dumps({"command": "execute", "code": code}) + b"\n"
+            for code in codes
+        ))
+        await self._process.stdin.drain()
+
+        results = []
+        while len(results) < len(codes):
+            line = await self._process.stdout.readline()
+            if not line:
+                raise ConnectionError("Blender exited")
+            if line.startswith(_RPC_MARKER):
+                results.append(orjson.loads(line[len(_RPC_MARKER):]))
+        return results
+
+    async def _kill_background(self):
+        """Kill the headless Blender without waiting for its pending scripts"""
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
 
     async def _execute_code_mcp_tools(self, code: str) -> Dict[str, Any]:
         """Execute code via MCP tools (through Claude)"""
@@ -185,6 +353,7 @@ class BlenderMCPClient:
             {
                 "status": "success" | "error",
                 "image_data": str (base64),
+                "image_bytes": bytes (socket mode only),
                 "format": str,
                 "width": int,
                 "height": int
@@ -200,51 +369,28 @@ class BlenderMCPClient:
         max_size: int,
         format: str
     ) -> Dict[str, Any]:
-        """Get screenshot via socket"""
-        code = f"""
-import bpy
-import io
-import base64
-from PIL import Image
+        """Get screenshot via socket (the image arrives as raw bytes, not base64 JSON)"""
+        try:
+            response = await self._socket_request(_frame({
+                "type": "get_viewport_image",
+                "params": {"max_size": max_size, "format": format}
+            }))
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
 
-def capture_viewport():
-    try:
-        # Find 3D viewport
-        for area in bpy.context.screen.areas:
-            if area.type == 'VIEW_3D':
-                override = bpy.context.copy()
-                override['area'] = area
-
-                # Capture to temp file
-                filepath = "C:/temp/blender_viewport.png"
-                bpy.ops.screen.screenshot(override, filepath=filepath)
-
-                # Load and resize
-                img = Image.open(filepath)
-                img.thumbnail(({max_size}, {max_size}), Image.LANCZOS)
-
-                # Convert to base64
-                buffer = io.BytesIO()
-                img.save(buffer, format='{format.upper()}')
-                img_bytes = buffer.getvalue()
-                img_b64 = base64.b64encode(img_bytes).decode()
-
-                return {{
-                    "status": "success",
-                    "image_data": img_b64,
-                    "format": "{format}",
-                    "width": img.width,
-                    "height": img.height
-                }}
-
-        return {{"status": "error", "message": "No 3D viewport found"}}
-    except Exception as e:
-        return {{"status": "error", "message": str(e)}}
+        if response.get("status") != "success":
+            return {"status": "error", "message": response.get("message", "Unknown error")}
 
-result = capture_viewport()
-print(json.dumps(result))
-"""
-        return await self.execute_code(code)
+        result = response["result"]
+        image_bytes = response.get("binary", b"")
+        return {
+            "status": "success",
+            "image_data": base64.b64encode(image_bytes).decode('ascii'),
+            "image_bytes": image_bytes,
+            "format": result.get("format", format),
+            "width": result.get("width"),
+            "height": result.get("height")
+        }
 
     async def _get_screenshot_mcp_tools(self, max_size: int) -> Dict[str, Any]:
         """Get screenshot via MCP tools"""
@@ -268,7 +414,59 @@ print(json.dumps(result))
 
     async def get_scene_info(self) -> Dict[str, Any]:
         """Get information about current scene"""
-        code = """
+        return await self.execute_code(_SCENE_INFO_CODE)
+
+    async def clear_scene(self, keep_camera: bool = True) -> Dict[str, Any]:
+        """Clear all objects from scene"""
+        return await self.execute_code(_CLEAR_SCENE_CODES[bool(keep_camera)])
+
+    async def download_model(
+        self,
+        source: str,
+        model_id: str,
+        import_location: tuple = (0, 0, 0)
+    ) -> Dict[str, Any]:
+        """
+        Download and import 3D model from external source
+
+        Args:
+            source: "polyhaven" | "sketchfab" | "hyper3d"
+            model_id: Model identifier
+            import_location: Where to place the model
+
+        Returns:
+            Status dict
+        """
+        code = f"""
+import bpy
+import json
+# Note: Actual implementation would require API integration
+# This is a template for the MCP addon to implement
+
+def download_model():
+    try:
+        # TODO: Implement model download via {source}
+        # Model ID: {model_id}
+        # Location: {import_location}
+
+        return {{
+            "status": "not_implemented",
+            "message": "Model download requires MCP addon support",
+            "source": "{source}",
+            "model_id": "{model_id}"
+        }}
+    except Exception as e:
+        return {{"status": "error", "message": str(e)}}
+
+result = download_model()
+print(json.dumps(result))
+"""
+        return await self.execute_code(code)
+
+
+# Scripts whose source never changes are module constants, so their wire
+# frames are built once (see _CONSTANT_FRAMES)
+_SCENE_INFO_CODE = """
 import bpy
 import json
 
@@ -316,14 +514,8 @@ def get_scene_info():
 result = get_scene_info()
 print(json.dumps(result))
 """
-        return await self.execute_code(code)
 
-    async def clear_scene(self, keep_camera: bool = True) -> Dict[str, Any]:
-        """Clear all objects from scene"""
-        keep_types = ["'CAMERA'", "'LIGHT'"] if keep_camera else ["'LIGHT'"]
-        keep_condition = f"obj.type not in [{', '.join(keep_types)}]"
-
-        code = f"""
+_CLEAR_SCENE_TEMPLATE = Template("""
 import bpy
 import json
 
@@ -332,7 +524,7 @@ def clear_scene():
         bpy.ops.object.select_all(action='DESELECT')
 
         for obj in bpy.data.objects:
-            if {keep_condition}:
+            if obj.type not in $keep_types:
                 obj.select_set(True)
 
         bpy.ops.object.delete()
@@ -340,57 +532,63 @@ def clear_scene():
         # Purge orphan data
         bpy.ops.outliner.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
 
-        return {{"status": "success", "message": "Scene cleared"}}
+        return {"status": "success", "message": "Scene cleared"}
     except Exception as e:
-        return {{"status": "error", "message": str(e)}}
+        return {"status": "error", "message": str(e)}
 
 result = clear_scene()
 print(json.dumps(result))
-"""
-        return await self.execute_code(code)
+""")
 
-    async def download_model(
-        self,
-        source: str,
-        model_id: str,
-        import_location: tuple = (0, 0, 0)
-    ) -> Dict[str, Any]:
-        """
-        Download and import 3D model from external source
+# Keyed by keep_camera
+_CLEAR_SCENE_CODES = {
+    True: _CLEAR_SCENE_TEMPLATE.substitute(keep_types="['CAMERA', 'LIGHT']"),
+    False: _CLEAR_SCENE_TEMPLATE.substitute(keep_types="['LIGHT']"),
+}
 
-        Args:
-            source: "polyhaven" | "sketchfab" | "hyper3d"
-            model_id: Model identifier
-            import_location: Where to place the model
 
-        Returns:
-            Status dict
-        """
-        code = f"""
-import bpy
-import json
-# Note: Actual implementation would require API integration
-# This is a template for the MCP addon to implement
+def _frame(message: Dict[str, Any]) -> bytes:
+    """Length-prefixed addon.py command message"""
+    payload = orjson.dumps(message)
+    return struct.pack('>I', len(payload)) + payload
 
-def download_model():
-    try:
-        # TODO: Implement model download via {source}
-        # Model ID: {model_id}
-        # Location: {import_location}
 
-        return {{
-            "status": "not_implemented",
-            "message": "Model download requires MCP addon support",
-            "source": "{source}",
-            "model_id": "{model_id}"
-        }}
-    except Exception as e:
-        return {{"status": "error", "message": str(e)}}
+def _execute_code_frame(code: str) -> bytes:
+    """Length-prefixed addon.py execute_code message for `code`"""
+    frame = _CONSTANT_FRAMES.get(code)
+    if frame is None:
+        frame = _frame({
+            "type": "execute_code",
+            "params": {"code": code}
+        })
+    return frame
 
-result = download_model()
-print(json.dumps(result))
-"""
-        return await self.execute_code(code)
+
+# Prebuilt frames for the constant scripts only; one-off scripts are framed
+# per call so they never hold on to large payloads
+_CONSTANT_FRAMES: Dict[str, bytes] = {}
+_CONSTANT_FRAMES.update(
+    (code, _execute_code_frame(code))
+    for code in (_SCENE_INFO_CODE, *_CLEAR_SCENE_CODES.values())
+)
+
+
+def _execute_code_response(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an addon.py execute_code reply onto execute_code's return shape"""
+    result = response.get("result") or {}
+    if response.get("status") != "success" or not result.get("executed", False):
+        return {
+            "status": "error",
+            "output": "",
+            "errors": [response.get("message") or result.get("error", "Unknown error")],
+            "result": None
+        }
+    return {
+        "status": "success",
+        "output": result.get("result", ""),  # Captured stdout
+        "errors": [],
+        "result": None
+    }
 
 
 class MCPToolCaller:
@@ -423,26 +621,34 @@ async def create_blender_client(
     mode: str = "socket",
     host: str = "localhost",
     port: int = 9876,
-    mcp_tool_caller=None
+    mcp_tool_caller=None,
+    blender_executable: str = "blender"
 ) -> BlenderMCPClient:
     """
     Create and connect a Blender MCP client
 
     Args:
-        mode: "socket" or "mcp_tools"
+        mode: "socket", "mcp_tools" or "background"
         host: Blender host (for socket mode)
         port: Blender port (for socket mode)
         mcp_tool_caller: Tool caller instance (for mcp_tools mode)
+        blender_executable: Blender binary to start (for background mode)
 
     Returns:
         Connected BlenderMCPClient
     """
-    connection_mode = ConnectionMode.SOCKET if mode == "socket" else ConnectionMode.MCP_TOOLS
+    if mode == "socket":
+        connection_mode = ConnectionMode.SOCKET
+    elif mode == "background":
+        connection_mode = ConnectionMode.BACKGROUND
+    else:
+        connection_mode = ConnectionMode.MCP_TOOLS
 
     config = BlenderConfig(
         host=host,
         port=port,
-        connection_mode=connection_mode
+        connection_mode=connection_mode,
+        blender_executable=blender_executable
     )
 
     client = BlenderMCPClient(config=config, mcp_tool_caller=mcp_tool_caller)
@@ -4,13 +4,14 @@ Implementation of the Analysis-by-Synthesis loop from arXiv:2601.11109v1.
 Supports Qwen3-VL and Gemini 3 Pro vision-language models.
 """
 
-from .memory import IterationContext, VIGAMemory
-from .modern_models import FoundationModel, Qwen3VL, Gemini3Pro, MockModel, get_model
+from .memory import CACHE_BREAKPOINT, IterationContext, VIGAMemory
+from .modern_models import FoundationModel, Qwen3VL, Gemini3Pro, MockModel, get_model, close_sessions
 from .agent import GeneratorAgent, VerifierAgent, VIGAAgent
 from .skills import SkillLibrary
 
 __all__ = [
     # Memory
+    "CACHE_BREAKPOINT",
     "IterationContext",
     "VIGAMemory",
     # Models
@@ -19,6 +20,7 @@ __all__ = [
     "Gemini3Pro",
     "MockModel",
     "get_model",
+    "close_sessions",
     # Agents
     "GeneratorAgent",
     "VerifierAgent",
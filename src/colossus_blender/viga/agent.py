@@ -9,7 +9,7 @@ from .memory import VIGAMemory, IterationContext
 from .skills import SkillLibrary
 from ..mcp_client import BlenderMCPClient
 from ..vision_utils import extract_code_from_response
-from .modern_models import FoundationModel, get_model
+from .modern_models import FoundationModel, get_model, close_sessions
 
 
 class GeneratorAgent:
@@ -95,6 +95,16 @@ class VIGAAgent:
         self.generator = GeneratorAgent(self.skills, self.model)
         self.verifier = VerifierAgent(self.skills, self.model)
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled model sessions for the running loop (call on shutdown)"""
+        await close_sessions()
+
     async def run_loop(self, task_instruction: str, max_iterations: int = 5):
         """
         Algorithm 1: VIGA Analysis-by-Synthesis Loop
@@ -3,10 +3,18 @@ VIGA Context Memory Management
 Implements the evolving context memory with sliding window as described in arXiv:2601.11109v1
 """
 
+from collections import deque
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import Deque, List, Dict, Any, Optional, Tuple
 import json
 
+# Marks the boundary between the cacheable prompt prefix and the volatile tail.
+# Callers that support provider-side prompt caching (e.g. Anthropic's
+# cache_control: {"type": "ephemeral"}) can split on it; others should request
+# the prompt without it.
+CACHE_BREAKPOINT = "<!-- cache_breakpoint -->"
+
 @dataclass
 class IterationContext:
     """Stores the context for a single iteration (t)"""
@@ -17,6 +25,14 @@ class IterationContext:
     execution_result: Optional[str] = None # stdout/stderr
     visual_feedback: Optional[str] = None # c_t (Verifier feedback)
     rendered_image_path: Optional[str] = None
+    _rendered: Optional[str] = field(default=None, repr=False, compare=False)
+
+    # (attribute, template) pairs rendered by to_prompt_str, in order
+    _FIELDS = (
+        ("plan", "**Plan**: {}"),
+        ("code", "**Code Generated**: \n```python\n{}\n```"),
+        ("visual_feedback", "**Verifier Feedback**: {}"),
+    )
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -27,45 +43,109 @@ class IterationContext:
         }
 
     def to_prompt_str(self) -> str:
-        """Format for VLM context consumption"""
+        """Format for VLM context consumption.
+
+        The result is cached: contexts are treated as immutable once they
+        have been added to memory.
+        """
+        if self._rendered is not None:
+            return self._rendered
         parts = [f"## Iteration {self.iteration_id}"]
-        if self.plan:
-            parts.append(f"**Plan**: {self.plan}")
-        if self.code:
-            parts.append(f"**Code Generated**: \n```python\n{self.code}\n```")
-        if self.visual_feedback:
-            parts.append(f"**Verifier Feedback**: {self.visual_feedback}")
-        return "\n".join(parts)
+        parts.extend(
+            template.format(value)
+            for attr, template in self._FIELDS
+            if (value := getattr(self, attr))
+        )
+        self._rendered = "\n".join(parts)
+        return self._rendered
 
 
 class VIGAMemory:
     """
     Evolving context memory M_t with sliding window Tail_L.
+
+    Only the most recent iterations are kept in `history` (a bounded deque);
+    older ones are moved to `archive` as they are evicted.
     """
     def __init__(self, window_size: int = 3):
-        self.history: List[IterationContext] = []
         self.window_size = window_size
+        self.history: Deque[IterationContext] = deque(maxlen=window_size * 4)
+        self.archive: List[IterationContext] = []
+        self._window: Optional[Tuple[IterationContext, ...]] = None
         self.static_context: Dict[str, Any] = {} # Initial task, inputs
+        self._static_prefix_key: Optional[Tuple] = None
+        self._static_prefix_str: str = ""
+        self._frozen_prefix_key: Optional[Tuple[int, int]] = None
+        self._frozen_prefix_cache: Optional[str] = None
+        self._latest_code: str = ""
 
     def add_iteration(self, context: IterationContext):
+        if len(self.history) == self.history.maxlen:
+            self.archive.append(self.history[0])
         self.history.append(context)
+        self._window = None
+        if context.code:
+            self._latest_code = context.code
+
+    @property
+    def iteration_count(self) -> int:
+        """Total number of iterations recorded, including archived ones"""
+        return len(self.archive) + len(self.history)
 
-    def get_context_window(self) -> List[IterationContext]:
+    def get_context_window(self) -> Tuple[IterationContext, ...]:
         """Returns Tail_L(M_t)"""
-        return self.history[-self.window_size:]
+        if self._window is None:
+            start = max(0, len(self.history) - self.window_size)
+            self._window = tuple(islice(self.history, start, None))
+        return self._window
 
-    def get_full_prompt(self) -> str:
-        """Constructs the prompt from the sliding window memory"""
+    def _render_static_prefix(self) -> str:
+        """Render static_context, re-rendering only when it has changed"""
+        key = tuple((k, repr(v)) for k, v in self.static_context.items())
+        if key != self._static_prefix_key:
+            lines = [f"**{k}**: {v}" for k, v in self.static_context.items()]
+            self._static_prefix_str = (
+                "### Task Context\n\n" + "\n".join(lines) + "\n\n" if lines else ""
+            )
+            self._static_prefix_key = key
+        return self._static_prefix_str
+
+    def _render_frozen_prefix(self, stable: Tuple[IterationContext, ...]) -> str:
+        """Render the older (immutable) window entries, cached per window position"""
+        if not stable:
+            return ""
+        key = (id(stable[0]), id(stable[-1]))
+        if key != self._frozen_prefix_key:
+            self._frozen_prefix_cache = "".join(
+                ctx.to_prompt_str() + "\n\n" for ctx in stable
+            )
+            self._frozen_prefix_key = key
+        return self._frozen_prefix_cache
+
+    def get_prompt_segments(self) -> Tuple[str, str]:
+        """Split the prompt into (stable prefix, volatile tail).
+
+        The stable prefix is [static context][older iterations] and only
+        changes when the window slides, so it can be served from a
+        provider's prefix cache; the tail holds the newest iteration.
+        """
         window = self.get_context_window()
-        prompt = "### Interaction History (Recent)\n\n"
-        for ctx in window:
-            prompt += ctx.to_prompt_str() + "\n\n"
-        return prompt
+        stable = "".join((
+            self._render_static_prefix(),
+            "### Interaction History (Recent)\n\n",
+            self._render_frozen_prefix(window[:-1]),
+        ))
+        volatile = window[-1].to_prompt_str() + "\n\n" if window else ""
+        return stable, volatile
+
+    def get_full_prompt(self, mark_cache_breakpoint: bool = False) -> str:
+        """Constructs the prompt from the sliding window memory"""
+        stable, volatile = self.get_prompt_segments()
+        if mark_cache_breakpoint:
+            return f"{stable}{CACHE_BREAKPOINT}\n{volatile}"
+        return f"{stable}{volatile}"
 
     def get_latest_code(self) -> str:
         """Retrieve p_{t-1} for diffing or extending"""
-        for ctx in reversed(self.history):
-            if ctx.code:
-                return ctx.code
-        return ""
+        return self._latest_code
 
@@ -9,17 +9,107 @@ text-only so the loop can keep making progress.
 """
 
 from abc import ABC, abstractmethod
+import asyncio
+import binascii
 import os
-from typing import List
+import re
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
 
 import aiohttp
+import orjson
 
 from ..vision_utils import normalize_vision_endpoint
 
+_DATA_URI_PREFIX = "data:image/png;base64,"
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Images may be raw PNG bytes or already base64-encoded strings
+ImageInput = Union[bytes, str]
+
+
+@lru_cache(maxsize=64)
+def _b64(image: bytes) -> str:
+    """Base64-encode image bytes (memoized: reference images repeat across iterations)"""
+    return binascii.b2a_base64(image, newline=False).decode("ascii")
+
+
+def _as_b64(image: ImageInput) -> str:
+    """Normalize an image input to a base64 string"""
+    return _b64(image) if isinstance(image, bytes) else image
+
+
+# Request bodies as slotted dataclasses: orjson serializes these natively,
+# without building an intermediate dict per call.
+@dataclass(slots=True)
+class _ChatPayload:
+    """OpenAI-compatible /chat/completions request body"""
+    model: str
+    messages: List[Dict[str, Any]]
+    temperature: float
+    max_tokens: int
+    stream: bool = False
+
+
+@dataclass(slots=True)
+class _GeminiPayload:
+    """Gemini generateContent request body (field names follow the REST API)"""
+    contents: List[Dict[str, Any]]
+    systemInstruction: Dict[str, Any]
+    generationConfig: Dict[str, Any]
+
+
+# Pooled sessions keyed by endpoint, so the analysis-by-synthesis loop keeps
+# connections alive across model calls instead of reconnecting every time.
+# Sessions and their lock belong to the loop that created them, so each
+# running loop gets its own pool; entries vanish with their loop.
+_SessionPool = Tuple[asyncio.Lock, Dict[str, aiohttp.ClientSession]]
+_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _SessionPool]" = weakref.WeakKeyDictionary()
+
+
+def _loop_pool() -> _SessionPool:
+    """Get (or create) the session pool for the running event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _POOLS.get(loop)
+    if pool is None:
+        pool = _POOLS[loop] = (asyncio.Lock(), {})
+    return pool
+
+
+async def _get_session(endpoint: str) -> aiohttp.ClientSession:
+    """Get (or lazily create) the running loop's pooled session for an endpoint"""
+    lock, sessions = _loop_pool()
+    async with lock:
+        session = sessions.get(endpoint)
+        if session is None or session.closed:
+            # Concurrent generator/verifier calls each take a kept-alive
+            # HTTP/1.1 connection from this pool; DNS results are cached so
+            # remote endpoints (Gemini) don't re-resolve every few seconds.
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            sessions[endpoint] = session
+        return session
+
+
+async def close_sessions():
+    """Close the running loop's pooled model sessions (call before the loop ends)"""
+    lock, sessions = _loop_pool()
+    async with lock:
+        to_close = list(sessions.values())
+        sessions.clear()
+    for session in to_close:
+        await session.close()
+
 class FoundationModel(ABC):
     @abstractmethod
-    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[str] = []) -> str:
-        """Generate text with optional image inputs"""
+    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[ImageInput] = []) -> str:
+        """Generate text with optional image inputs (PNG bytes or base64 strings)"""
         pass
 
 class Qwen3VL(FoundationModel):
@@ -34,59 +124,114 @@ class Qwen3VL(FoundationModel):
             os.getenv("QWEN3_VL_ENDPOINT", os.getenv("VISION_MODEL_ENDPOINT", "http://localhost:8000/v1"))
         )
         self.timeout_s = float(os.getenv("QWEN3_VL_TIMEOUT", "300"))
+        self._timeout = aiohttp.ClientTimeout(total=self.timeout_s)
         self.temperature = float(os.getenv("QWEN3_VL_TEMPERATURE", "0.3"))
         self.max_tokens = int(os.getenv("QWEN3_VL_MAX_TOKENS", "2048"))
         self.served_model = os.getenv("QWEN3_VL_MODEL", self.model_name)
         
-    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[str] = []) -> str:
+    def _build_messages(self, system_prompt: str, user_prompt: str, images: List[ImageInput]) -> List[Dict[str, Any]]:
         messages = [{"role": "system", "content": system_prompt}]
 
         if images:
             content_parts = [{"type": "text", "text": user_prompt}]
-            for img_b64 in images:
-                if not img_b64:
+            for img in images:
+                if not img:
                     continue
                 content_parts.append(
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{img_b64}"},
+                        "image_url": {"url": _DATA_URI_PREFIX + _as_b64(img)},
                     }
                 )
             messages.append({"role": "user", "content": content_parts})
         else:
             messages.append({"role": "user", "content": user_prompt})
 
-        payload = {
-            "model": self.served_model,
-            "messages": messages,
-            "temperature": self.temperature,
-            "max_tokens": self.max_tokens,
-        }
+        return messages
+
+    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[ImageInput] = []) -> str:
+        payload = _ChatPayload(
+            model=self.served_model,
+            messages=self._build_messages(system_prompt, user_prompt, images),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        )
 
         url = f"{self.endpoint}/chat/completions"
-        timeout = aiohttp.ClientTimeout(total=self.timeout_s)
-
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, json=payload) as resp:
-                # If backend rejects multimodal schema, retry as text-only.
-                if resp.status == 400 and images:
-                    payload["messages"] = [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ]
-                    async with session.post(url, json=payload) as resp2:
-                        if resp2.status != 200:
-                            text2 = await resp2.text()
-                            raise RuntimeError(f"Qwen3-VL request failed ({resp2.status}): {text2}")
-                        data2 = await resp2.json()
-                        return data2["choices"][0]["message"]["content"]
-
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise RuntimeError(f"Qwen3-VL request failed ({resp.status}): {text}")
-
-                data = await resp.json()
-                return data["choices"][0]["message"]["content"]
+
+        # orjson encodes the large base64 image strings much faster than the
+        # stdlib encoder aiohttp uses for json=
+        session = await _get_session(self.endpoint)
+        async with session.post(
+            url, data=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=self._timeout
+        ) as resp:
+            # If backend rejects multimodal schema, retry as text-only.
+            if resp.status == 400 and images:
+                payload.messages = [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ]
+                async with session.post(
+                    url, data=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=self._timeout
+                ) as resp2:
+                    if resp2.status != 200:
+                        text2 = await resp2.text()
+                        raise RuntimeError(f"Qwen3-VL request failed ({resp2.status}): {text2}")
+                    data2 = orjson.loads(await resp2.read())
+                    return data2["choices"][0]["message"]["content"]
+
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"Qwen3-VL request failed ({resp.status}): {text}")
+
+            data = orjson.loads(await resp.read())
+            return data["choices"][0]["message"]["content"]
+
+    async def generate_text_stream(
+        self, system_prompt: str, user_prompt: str, images: List[ImageInput] = []
+    ) -> AsyncIterator[str]:
+        """Stream the response as text deltas via server-sent events.
+
+        Lets the caller start parsing before generation finishes (e.g. stop
+        as soon as a code block closes).
+        """
+        payload = _ChatPayload(
+            model=self.served_model,
+            messages=self._build_messages(system_prompt, user_prompt, images),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+        )
+
+        url = f"{self.endpoint}/chat/completions"
+
+        session = await _get_session(self.endpoint)
+        async with session.post(
+            url, data=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=self._timeout
+        ) as resp:
+            # Same text-only fallback as generate_text.
+            if resp.status == 400 and images:
+                async for delta in self.generate_text_stream(system_prompt, user_prompt):
+                    yield delta
+                return
+
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"Qwen3-VL request failed ({resp.status}): {text}")
+
+            async for raw_line in resp.content:
+                line = raw_line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                choices = orjson.loads(data).get("choices")
+                if not choices:
+                    continue
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
 
 class Gemini3Pro(FoundationModel):
     """
@@ -104,10 +249,19 @@ class Gemini3Pro(FoundationModel):
             "https://generativelanguage.googleapis.com/v1beta"
         )
         self.timeout_s = float(os.getenv("GEMINI_TIMEOUT", "120"))
+        self._timeout = aiohttp.ClientTimeout(total=self.timeout_s)
         self.temperature = float(os.getenv("GEMINI_TEMPERATURE", "0.4"))
         self.max_tokens = int(os.getenv("GEMINI_MAX_TOKENS", "2048"))
+        self._generation_config = {
+            "temperature": self.temperature,
+            "maxOutputTokens": self.max_tokens,
+        }
+        # Send the key as a header rather than a ?key= query parameter so it
+        # doesn't end up in URL logs and traces.
+        self._url = f"{self.endpoint}/models/{self.model_name}:generateContent"
+        self._headers = {"x-goog-api-key": self.api_key, **_JSON_HEADERS}
 
-    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[str] = []) -> str:
+    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[ImageInput] = []) -> str:
         if not self.api_key:
             raise RuntimeError(
                 "Gemini API key not configured. Set GOOGLE_AI_API_KEY or GEMINI_API_KEY env var."
@@ -117,67 +271,68 @@ class Gemini3Pro(FoundationModel):
         parts = []
         
         # Add images first (Gemini prefers images before text)
-        for img_b64 in images:
-            if not img_b64:
+        for img in images:
+            if not img:
                 continue
             parts.append({
                 "inline_data": {
                     "mime_type": "image/png",
-                    "data": img_b64
+                    "data": _as_b64(img)
                 }
             })
         
         # Add text prompt
         parts.append({"text": user_prompt})
 
-        payload = {
-            "contents": [{"parts": parts}],
-            "systemInstruction": {"parts": [{"text": system_prompt}]},
-            "generationConfig": {
-                "temperature": self.temperature,
-                "maxOutputTokens": self.max_tokens,
-            }
-        }
+        payload = _GeminiPayload(
+            contents=[{"parts": parts}],
+            systemInstruction={"parts": [{"text": system_prompt}]},
+            generationConfig=self._generation_config,
+        )
 
-        url = f"{self.endpoint}/models/{self.model_name}:generateContent?key={self.api_key}"
-        timeout = aiohttp.ClientTimeout(total=self.timeout_s)
-
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, json=payload) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise RuntimeError(f"Gemini request failed ({resp.status}): {text}")
-                
-                data = await resp.json()
-                
-                # Extract text from response
-                try:
-                    candidates = data.get("candidates", [])
-                    if not candidates:
-                        raise RuntimeError(f"Gemini returned no candidates: {data}")
-                    content = candidates[0].get("content", {})
-                    parts = content.get("parts", [])
-                    if not parts:
-                        raise RuntimeError(f"Gemini returned no parts: {data}")
-                    return parts[0].get("text", "")
-                except (KeyError, IndexError) as e:
-                    raise RuntimeError(f"Failed to parse Gemini response: {e}, data={data}")
 
-class MockModel(FoundationModel):
-    """Temporary mock for testing logic flow"""
-    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[str] = []) -> str:
-        if "plan" in user_prompt.lower():
-            return """```json
+        session = await _get_session(self.endpoint)
+        async with session.post(
+            self._url, data=orjson.dumps(payload), headers=self._headers, timeout=self._timeout
+        ) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"Gemini request failed ({resp.status}): {text}")
+            
+            data = orjson.loads(await resp.read())
+            
+            # Extract text from response
+            try:
+                candidates = data.get("candidates", [])
+                if not candidates:
+                    raise RuntimeError(f"Gemini returned no candidates: {data}")
+                content = candidates[0].get("content", {})
+                parts = content.get("parts", [])
+                if not parts:
+                    raise RuntimeError(f"Gemini returned no parts: {data}")
+                return parts[0].get("text", "")
+            except (KeyError, IndexError) as e:
+                raise RuntimeError(f"Failed to parse Gemini response: {e}, data={data}")
+
+_MOCK_PLAN_RE = re.compile("plan", re.IGNORECASE)
+_MOCK_PLAN_RESPONSE = """```json
 {
     "subtasks": [{"id": "1", "description": "Create base mesh"}]
 }
 ```"""
-        return """```python
+_MOCK_CODE_RESPONSE = """```python
 import bpy
 # Mock generation
 bpy.ops.mesh.primitive_cube_add()
 ```"""
 
+class MockModel(FoundationModel):
+    """Temporary mock for testing logic flow"""
+    async def generate_text(self, system_prompt: str, user_prompt: str, images: List[ImageInput] = []) -> str:
+        if _MOCK_PLAN_RE.search(user_prompt):
+            return _MOCK_PLAN_RESPONSE
+        return _MOCK_CODE_RESPONSE
+
 def get_model(name: str) -> FoundationModel:
     lower = name.lower()
     if "qwen" in lower:
@@ -4,10 +4,20 @@ Shared utilities for vision model integrations.
 
 from __future__ import annotations
 
-import json
-from typing import Any, Dict, Iterable, List
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List
 
+import orjson
 
+# Fenced blocks in model responses; an unterminated ```json block runs to the end
+_JSON_BLOCK_RE = re.compile(r"```json(.*?)(?:```|\Z)", re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_PYTHON_BLOCK_RE = re.compile(r"```python(.*?)```", re.DOTALL)
+_ANY_BLOCK_RE = re.compile(r"```(.*?)```", re.DOTALL)
+
+
+@lru_cache(maxsize=16)
 def normalize_vision_endpoint(endpoint: str) -> str:
     """Normalize an OpenAI-compatible base endpoint to include /v1.
 
@@ -17,9 +27,7 @@ def normalize_vision_endpoint(endpoint: str) -> str:
         http://localhost:8000/v1 -> http://localhost:8000/v1
     """
     normalized = endpoint.rstrip("/")
-    if normalized.endswith("/v1"):
-        return normalized
-    return f"{normalized}/v1"
+    return normalized if normalized.endswith("/v1") else normalized + "/v1"
 
 
 def extract_json_from_content(content: str) -> Dict[str, Any]:
@@ -27,36 +35,36 @@ def extract_json_from_content(content: str) -> Dict[str, Any]:
 
     Supports fenced code blocks and raw JSON payloads.
     """
-    if "```json" in content:
-        json_content = content.split("```json")[1].split("```")[0].strip()
-    elif "{" in content and "}" in content:
-        start = content.find("{")
-        end = content.rfind("}") + 1
-        json_content = content[start:end]
+    match = _JSON_BLOCK_RE.search(content)
+    if match:
+        json_content = match.group(1).strip()
     else:
-        json_content = content.strip()
+        match = _JSON_OBJECT_RE.search(content)
+        json_content = match.group(0) if match else content.strip()
 
-    return json.loads(json_content)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers'
+    # existing except clauses still apply.
+    return orjson.loads(json_content)
 
 
-def _iter_model_ids(models_payload: Dict[str, Any]) -> Iterable[str]:
+def _iter_model_ids(models_payload: Dict[str, Any]) -> Iterator[str]:
     """Yield model IDs from an OpenAI-compatible /models payload."""
     if not models_payload:
-        return []
-
-    if isinstance(models_payload.get("data"), list):
-        return [item.get("id", "") for item in models_payload["data"]]
+        return
 
-    if isinstance(models_payload.get("models"), list):
-        return [item.get("id", "") for item in models_payload["models"]]
+    items = models_payload.get("data")
+    if not isinstance(items, list):
+        items = models_payload.get("models")
+    if not isinstance(items, list):
+        return
 
-    return []
+    for item in items:
+        yield item.get("id", "")
 
 
 def is_model_available(model_name: str, models_payload: Dict[str, Any]) -> bool:
     """Check if a model name exists in a /models payload."""
-    model_ids = [model_id for model_id in _iter_model_ids(models_payload) if model_id]
-    return model_name in model_ids
+    return any(model_id == model_name for model_id in _iter_model_ids(models_payload) if model_id)
 
 
 def list_available_models(models_payload: Dict[str, Any]) -> List[str]:
@@ -72,14 +80,9 @@ def extract_code_from_response(response: str) -> str:
     - Generic ``` ... ``` blocks
     - Raw code (no blocks)
     """
-    if "```python" in response:
-        start = response.find("```python") + len("```python")
-        end = response.find("```", start)
-        if end > start:
-            return response[start:end].strip()
-    elif "```" in response:
-        start = response.find("```") + 3
-        end = response.find("```", start)
-        if end > start:
-            return response[start:end].strip()
+    match = _PYTHON_BLOCK_RE.search(response)
+    if match is None and "```python" not in response:
+        match = _ANY_BLOCK_RE.search(response)
+    if match and match.group(1):
+        return match.group(1).strip()
     return response.strip()